@@ -0,0 +1,72 @@
+"""
+Measure the time to reduce a metric to the bins of a plot, with a Python loop
+over the bins and with the vectorized aggregation of the utilities.
+
+    python3 -m benchmark.binning
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from mindpark.utility import aggregate, bin_borders
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        'binning', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '-n', '--rows', type=int, default=1000000,
+        help='how many rows the metric has')
+    parser.add_argument(
+        '-b', '--bins', type=int, default=1000,
+        help='into how many bins to reduce the rows')
+    parser.add_argument(
+        '-c', '--columns', type=int, default=8,
+        help='how many columns the metric has for the mean')
+    return parser.parse_args(args)
+
+
+def loop_aggregate(values, borders, reducer):
+    # The previous implementation, which calls the reducer for every bin. It
+    # failed on empty bins, which are skipped here to allow the comparison.
+    groups = []
+    for start, stop in zip(borders[:-1], borders[1:]):
+        if start < stop:
+            groups.append(reducer(values[start: stop]))
+    return np.array(groups)
+
+
+def measure(function, repeats=3):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(args):
+    args = parse_args(args)
+    domain = np.sort(np.random.uniform(0, 100, args.rows))
+    line = np.random.normal(0, 1, args.rows)
+    count = np.random.uniform(0, 1, (args.rows, args.columns))
+    borders = bin_borders(domain, args.bins)
+    cases = [
+        ('percentiles loop', lambda: [loop_aggregate(
+            line, borders, lambda x: np.percentile(x, y, 0))
+            for y in (10, 50, 90)]),
+        ('percentiles vectorized', lambda: aggregate(
+            line, borders, (10, 50, 90))),
+        ('mean loop', lambda: loop_aggregate(
+            count, borders, lambda x: np.mean(x, 0))),
+        ('mean vectorized', lambda: aggregate(count, borders, 'mean')),
+    ]
+    print('{} rows into {} bins'.format(args.rows, args.bins))
+    for name, function in cases:
+        duration = measure(function)
+        print('{:<24} {:8.1f} ms'.format(name, 1e3 * duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
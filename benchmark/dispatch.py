@@ -0,0 +1,89 @@
+"""
+Measure the overhead per time step of the dqn_2015 preprocessing chain on a
+trivial environment, with protocol checks in every step and with the checks
+only at the boundary of the chain.
+
+    python3 -O -m benchmark.dispatch
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from gym.spaces import Box, Discrete
+import mindpark as mp
+import mindpark.step
+import mindpark.part.preprocess
+
+
+class ConstantEnv(mp.Env):
+
+    """
+    Environment that returns the same Atari sized frame forever.
+    """
+
+    def __init__(self):
+        self._frame = np.zeros(self.observs.shape, np.uint8)
+
+    @property
+    def observs(self):
+        return Box(0, 255, (210, 160, 3))
+
+    @property
+    def actions(self):
+        return Discrete(6)
+
+    def reset(self):
+        return self._frame
+
+    def step(self, action):
+        return 0, self._frame
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        'dispatch', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '-s', '--steps', type=int, default=20000,
+        help='how many time steps to simulate per mode')
+    return parser.parse_args(args)
+
+
+def create_policy(env, optimize):
+    task = mp.Task(env.observs, env.actions, None, 1e9, 1, True)
+    policy = mp.Sequential(task)
+    policy.add(mp.part.preprocess.dqn_2015)
+    policy.add(mp.step.Random)
+    policy.optimize(optimize)
+    return policy
+
+
+def measure(env, policy, steps):
+    policy.begin_episode(0, True)
+    observ = env.reset()
+    start = time.perf_counter()
+    for index in range(steps):
+        action = policy.observe(observ)
+        reward, observ = env.step(action)
+        policy.receive(reward, index == steps - 1)
+    duration = time.perf_counter() - start
+    policy.end_episode()
+    return duration / steps
+
+
+def main(args):
+    args = parse_args(args)
+    env = ConstantEnv()
+    if not sys.flags.optimize:
+        print('Run with -O to exclude assertions from the measurements.')
+    for optimize in (False, True):
+        policy = create_policy(env, optimize)
+        steps = len(policy.recursive_steps)
+        duration = measure(env, policy, args.steps)
+        mode = 'boundary checks' if optimize else 'checks in every step'
+        message = '{:<22} {} steps {:8.1f} us per time step'
+        print(message.format(mode, steps, 1e6 * duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
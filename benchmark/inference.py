@@ -0,0 +1,102 @@
+"""
+Measure the throughput of computing actions from many threads on a shared
+model, with a global lock around every run as before, with concurrent runs,
+and with the readers-writer mode. Optionally, another thread trains the
+model at the same time.
+
+    python3 -m benchmark.inference
+"""
+
+import argparse
+import sys
+import threading
+import time
+import numpy as np
+import tensorflow as tf
+from mindpark.model import Model
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        'inference', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '-t', '--threads', type=int, nargs='+', default=[1, 4, 16],
+        help='numbers of threads that compute actions')
+    parser.add_argument(
+        '-c', '--calls', type=int, default=2000,
+        help='how many actions to compute in total per measurement')
+    parser.add_argument(
+        '-l', '--learner', action='store_true', default=False,
+        help='train the model from another thread at the same time')
+    return parser.parse_args(args)
+
+
+def create_network(model):
+    model.set_optimizer(tf.train.RMSPropOptimizer(1e-4))
+    state = model.add_input('state', 256)
+    target = model.add_input('target', 6)
+    hidden = tf.layers.dense(state, 512, tf.nn.relu)
+    hidden = tf.layers.dense(hidden, 512, tf.nn.relu)
+    value = model.add_output('value', tf.layers.dense(hidden, 6))
+    model.add_cost('cost', (value - target) ** 2)
+
+
+def measure(model, threads, calls, learner, lock=None):
+    state = np.random.uniform(0, 1, 256)
+    done = threading.Event()
+
+    def compute():
+        for _ in range(calls // threads):
+            if lock:
+                with lock:
+                    model.compute('value', state=state)
+            else:
+                model.compute('value', state=state)
+
+    def train():
+        batch = dict(
+            state=np.random.uniform(0, 1, (32, 256)),
+            target=np.random.uniform(0, 1, (32, 6)))
+        while not done.is_set():
+            if lock:
+                with lock:
+                    model.train('cost', **batch)
+            else:
+                model.train('cost', **batch)
+
+    workers = [threading.Thread(target=compute) for _ in range(threads)]
+    trainer = threading.Thread(target=train)
+    if learner:
+        trainer.start()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration = time.perf_counter() - start
+    done.set()
+    if learner:
+        trainer.join()
+    return (calls // threads) * threads / duration
+
+
+def main(args):
+    args = parse_args(args)
+    cases = [
+        ('global lock', Model(create_network), threading.Lock()),
+        ('concurrent', Model(create_network), None),
+        ('readers-writer', Model(create_network, locking=True), None),
+    ]
+    print('{:<16}'.format('threads') + ''.join(
+        '{:>12}'.format(x) for x in args.threads))
+    for name, model, lock in cases:
+        measure(model, 1, 100, False, lock)
+        rates = [
+            measure(model, x, args.calls, args.learner, lock)
+            for x in args.threads]
+        print('{:<16}'.format(name) + ''.join(
+            '{:>10.0f}/s'.format(x) for x in rates))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
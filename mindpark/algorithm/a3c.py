@@ -36,8 +36,12 @@ class A3C(mp.Algorithm):
             float(self.config.initial_learning_rate), 0, self.task.steps)
         self.lock = Lock()
         self.cost_metric = mp.Metric(self.task, 'a3c/cost', 1)
-        self.value_metric = mp.Metric(self.task, 'a3c/value', 1)
-        self.choice_metric = mp.Metric(self.task, 'a3c/choice', 1)
+        self.value_metric = mp.Metric(
+            self.task, 'a3c/value', 1, aggregate=mp.aggregate.Reduce())
+        self.choice_metric = mp.Metric(
+            self.task, 'a3c/choice', 1,
+            aggregate=mp.aggregate.Histogram(
+                self._preprocess.above_task.actions.n))
 
     @property
     def train_policies(self):
@@ -95,7 +99,7 @@ class Train(mp.step.Experience):
         observ_shape = self.task.observs.shape
         shapes = (observ_shape, tuple(), tuple(), observ_shape)
         self._batch = mp.part.replay.Sequential(
-            self._config.apply_gradient, shapes)
+            self._config.apply_gradient, shapes, dtype=self.task.dtype)
         self._context_last_batch = None
 
     def begin_episode(self, episode, training):
@@ -106,7 +106,8 @@ class DDQN(mp.Algorithm, mp.step.Experience):
     def _create_memory(self):
         observ_shape = self._preprocess.above_task.observs.shape
         shapes = observ_shape, tuple(), tuple(), observ_shape
-        memory = mp.part.replay.Random(self.config.replay_capacity, shapes)
+        memory = mp.part.replay.Random(
+            self.config.replay_capacity, shapes, dtype=self.task.dtype)
         memory.log_memory_size()
         return memory
 
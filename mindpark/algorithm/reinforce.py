@@ -39,13 +39,19 @@ class Reinforce(mp.Algorithm):
         super().__init__(task, config)
         self._parse_config()
         self._preprocess = self._create_preprocess()
+        # The heads compute actions in parallel while one of them trains.
         self.model = mp.model.Model(
-            self._create_network, clip_delta=self.config.gradient_clipping)
+            self._create_network, clip_delta=self.config.gradient_clipping,
+            locking=True)
         print(str(self.model))
         self._learning_rate = mp.utility.Decay(
             self.config.initial_learning_rate, 0, self.task.steps)
-        self.value_metric = mp.Metric(self.task, 'reinforce/value', 1)
-        self.choice_metric = mp.Metric(self.task, 'reinforce/choice', 1)
+        self.value_metric = mp.Metric(
+            self.task, 'reinforce/value', 1, aggregate=mp.aggregate.Reduce())
+        self.choice_metric = mp.Metric(
+            self.task, 'reinforce/choice', 1,
+            aggregate=mp.aggregate.Histogram(
+                self._preprocess.above_task.actions.n))
         self._cost_metric = mp.Metric(self.task, 'reinforce/cost', 1)
         self._learning_rate_metric = mp.Metric(
             self.task, 'reinforce/learning_rate', 1)
@@ -125,7 +131,8 @@ class Reinforce(mp.Algorithm):
     def _create_memory(self):
         observ_shape = self._preprocess.above_task.observs.shape
         shapes = observ_shape, tuple(), tuple(), observ_shape
-        memory = mp.part.replay.Sequential(self.config.update_every, shapes)
+        memory = mp.part.replay.Sequential(
+            self.config.update_every, shapes, dtype=self.task.dtype)
         memory.log_memory_size()
         return memory
 
@@ -1,8 +1,11 @@
+from . import aggregate
 from .algorithm import Algorithm
 from .env import Env
 from .metric import Metric
 from .partial import Partial
 from .policy import Policy
+from .profiler import Profiler
 from .sequential import Sequential
 from .simulator import Simulator
 from .task import Task
+from .writer import MetricWriter
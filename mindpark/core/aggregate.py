@@ -0,0 +1,206 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class Aggregate(ABC):
+
+    """
+    Reduce the rows of a metric in memory before they are written. Rows are
+    grouped by epoch, training flag and windows of the specified number of
+    task steps. Subclasses keep a running state per group, so that memory
+    does not grow with the window. A group is reduced when the next group
+    starts or when the metric is flushed.
+    """
+
+    def __init__(self, every=100):
+        if every < 1:
+            raise ValueError('must aggregate over at least one step')
+        self._every = every
+        self._key = None
+        self._meta = None
+
+    def columns(self, columns):
+        """
+        Names of the stored columns, given the names of the input columns.
+        """
+        return columns
+
+    def add(self, meta, values):
+        """
+        Add a row and return the list of reduced rows that are complete, each
+        as a tuple of meta data and values.
+        """
+        step, epoch, training, _ = meta
+        key = epoch, training, step // self._every
+        done = []
+        if key != self._key:
+            done = self.drain()
+            self._key = key
+        self._meta = meta
+        self.update(meta, np.asarray(values, float))
+        return done
+
+    def extend(self, meta, rows):
+        """
+        Add multiple rows that share the same meta data and return the list
+        of reduced rows that are complete.
+        """
+        done = self.add(meta, rows[0])
+        self.update_rows(meta, np.asarray(rows[1:], float))
+        return done
+
+    def drain(self):
+        """
+        Reduce and return the pending rows.
+        """
+        if self._meta is None:
+            return []
+        meta, self._meta = self._meta, None
+        return self.reduce(meta)
+
+    @abstractmethod
+    def update(self, meta, values):
+        """
+        Add a row to the state of the current group.
+        """
+        pass
+
+    def update_rows(self, meta, rows):
+        """
+        Add multiple rows to the state of the current group. Subclasses can
+        override this to avoid the loop.
+        """
+        for values in rows:
+            self.update(meta, values)
+
+    @abstractmethod
+    def reduce(self, meta):
+        """
+        Return the list of rows to store for the current group, each as a
+        tuple of meta data and values, and reset the state for the next
+        group. The meta data of the latest row in the group is given.
+        """
+        pass
+
+
+class Reduce(Aggregate):
+
+    """
+    Store one row per group that is the mean, minimum, or maximum of the
+    rows, or the number of rows in the group. The row is stored with the
+    meta data of the latest row in the group.
+    """
+
+    REDUCERS = {
+        'mean': np.add,
+        'min': np.minimum,
+        'max': np.maximum,
+        'count': None,
+    }
+
+    def __init__(self, reducer='mean', every=100):
+        super().__init__(every)
+        if reducer not in self.REDUCERS:
+            message = "unknown reducer '{}', choose one of {}"
+            raise KeyError(message.format(reducer, sorted(self.REDUCERS)))
+        self._reducer = reducer
+        self._state = None
+        self._count = 0
+
+    def update(self, meta, values):
+        if not self._count:
+            self._state = values.copy()
+        elif self.REDUCERS[self._reducer]:
+            self.REDUCERS[self._reducer](self._state, values, out=self._state)
+        self._count += 1
+
+    def update_rows(self, meta, rows):
+        if not len(rows):
+            return
+        if self.REDUCERS[self._reducer]:
+            combined = self.REDUCERS[self._reducer].reduce(rows, 0)
+            self.REDUCERS[self._reducer](
+                self._state, combined, out=self._state)
+        self._count += len(rows)
+
+    def reduce(self, meta):
+        if self._reducer == 'mean':
+            row = self._state / self._count
+        elif self._reducer == 'count':
+            row = np.full(len(self._state), self._count)
+        else:
+            row = self._state
+        self._state, self._count = None, 0
+        return [(meta, row)]
+
+
+class Reservoir(Aggregate):
+
+    """
+    Store a uniform random sample of at most the specified number of rows per
+    group, in the order they were added and with their own meta data.
+    Sampled with Algorithm R, so that only the sample is kept in memory.
+    """
+
+    def __init__(self, size, every=100, seed=None):
+        super().__init__(every)
+        self._size = size
+        self._random = np.random.RandomState(seed)
+        self._sample = None
+        self._metas = [None] * size
+        self._order = np.empty(size, int)
+        self._seen = 0
+
+    def update(self, meta, values):
+        if self._sample is None:
+            self._sample = np.empty((self._size, len(values)))
+        index = self._seen
+        if index >= self._size:
+            index = self._random.randint(0, self._seen + 1)
+        if index < self._size:
+            self._sample[index] = values
+            self._metas[index] = meta
+            self._order[index] = self._seen
+        self._seen += 1
+
+    def reduce(self, meta):
+        count = min(self._seen, self._size)
+        order = np.argsort(self._order[:count])
+        rows = [(self._metas[x], self._sample[x]) for x in order]
+        self._sample, self._seen = None, 0
+        self._metas = [None] * self._size
+        return rows
+
+
+class Histogram(Aggregate):
+
+    """
+    Store one row per group counting how often the categorical value of the
+    first column fell into each of the bins. Values are rounded to integers
+    and clipped into the range of bins. The row is stored with the meta data
+    of the latest row in the group.
+    """
+
+    def __init__(self, bins, every=100):
+        super().__init__(every)
+        self._bins = bins
+        self._counts = np.zeros(bins, int)
+
+    def columns(self, columns):
+        if len(columns) != 1:
+            raise ValueError('histograms need exactly one column')
+        return ['bin_{}'.format(x) for x in range(self._bins)]
+
+    def update(self, meta, values):
+        index = int(np.clip(np.round(values[0]), 0, self._bins - 1))
+        self._counts[index] += 1
+
+    def update_rows(self, meta, rows):
+        indices = np.clip(np.round(rows[:, 0]), 0, self._bins - 1)
+        self._counts += np.bincount(
+            indices.astype(int), minlength=self._bins)
+
+    def reduce(self, meta):
+        counts = self._counts
+        self._counts = np.zeros(self._bins, int)
+        return [(meta, counts)]
@@ -1,47 +1,174 @@
 from threading import Lock
-from datetime import datetime
 import time
-import uuid
-import sqlalchemy as sql
-import mindpark as mp
-from mindpark.utility import Uuid
+import numpy as np
+from mindpark.core import storage
+from mindpark.core.writer import MetricWriter
 
 
 class Metric:
 
-    def __init__(self, task, name, columns, flush_interval=5):
-        self.columns = self._parse_columns(columns)
+    """
+    Store rows of values together with the current step, epoch, training flag
+    and episode of the task. Rows are buffered in NumPy columns that grow in
+    chunks. Flushing hands them to the shared writer of the task directory,
+    which stores them in the background. This happens when the flush interval
+    has passed, also if the metric is no longer called, or when the buffer
+    reaches the maximum number of rows. Optionally, an aggregation from
+    `mindpark.core.aggregate` reduces the rows before they are buffered.
+
+    Vector metrics take a single array per call, with as many values as the
+    number of columns. They are stored as one column of packed float32
+    values and read back as a two dimensional array.
+    """
+
+    META = storage.META
+
+    def __init__(
+            self, task, name, columns, flush_interval=5, chunk=1024,
+            max_rows=8192, aggregate=None, vector=False):
+        if vector and not isinstance(columns, int):
+            raise ValueError('vector metrics need the number of values')
+        self.inputs = self._parse_columns(columns)
+        self.columns = self.inputs
+        if aggregate:
+            self.columns = aggregate.columns(self.inputs)
+        if vector and len(self.columns) != len(self.inputs):
+            raise ValueError('aggregation must keep the values of vectors')
         self.name = name
+        self.vector = vector
+        self._aggregate = aggregate
         self._task = task
         self._flush_interval = flush_interval
         self._last_flush = time.time()
-        self._buffer = []
-        self._engine = self._get_engine()
-        self._table = self._create_table(self.columns)
-        self._insert = self._table.insert()
+        self._chunk = chunk
+        self._max_rows = max_rows
+        self._meta = np.zeros((chunk, len(self.META)), np.int64)
+        dtype = np.float32 if vector else np.float64
+        self._values = np.zeros((chunk, len(self.columns)), dtype)
+        self._size = 0
+        self._writer = MetricWriter.get(self._task.directory)
+        if vector:
+            self.columns = ['vector']
+            self._handle = self._writer.create(
+                name, self.columns, len(self.inputs))
+        else:
+            self._handle = self._writer.create(name, self.columns)
         self._lock = Lock()
+        self._writer.register(self)
 
     def __call__(self, *values):
-        values = self._parse_values(values)
-        row = dict(
-            step=int(self._task.step),
-            epoch=int(self._task.epoch),
-            training=bool(self._task.training),
-            episode=int(self._task.episode))
-        row.update(values)
-        self._buffer.append(row)
-        if time.time() >= self._last_flush + self._flush_interval:
-            self.flush()
-
-    @mp.utility.synchronized
-    def flush(self):
-        if not self._buffer:
+        if self.vector:
+            if len(values) != 1:
+                raise ValueError('vector metrics take a single array')
+            values = values[0]
+        if len(values) != len(self.inputs):
+            message = 'need one value for each column, expected {} got {}'
+            raise ValueError(message.format(len(self.inputs), len(values)))
+        meta = (
+            int(self._task.step), int(self._task.epoch),
+            bool(self._task.training), int(self._task.episode))
+        with self._lock:
+            if not self._aggregate:
+                self._append(meta, values)
+            else:
+                for meta, values in self._aggregate.add(meta, values):
+                    self._append(meta, values)
+        if self._size >= self._max_rows or self.due(time.time()):
+            self.flush(wait=False)
+
+    def extend(self, rows):
+        """
+        Store multiple rows at once, for example one per environment of a
+        batch. Takes a two dimensional array with one row per entry, or a one
+        dimensional array for metrics with a single column. All rows share
+        the current meta data of the task.
+        """
+        rows = np.asarray(rows)
+        if rows.ndim == 1 and len(self.inputs) == 1:
+            rows = rows[:, None]
+        if rows.ndim != 2 or rows.shape[1] != len(self.inputs):
+            message = 'need rows of one value for each column, expected {}'
+            raise ValueError(message.format(len(self.inputs)))
+        if not len(rows):
             return
-        self._last_flush = time.time()
-        insert = self._insert.values()
-        with self._engine.begin() as connection:
-            connection.execute(insert, self._buffer)
-        self._buffer = []
+        meta = (
+            int(self._task.step), int(self._task.epoch),
+            bool(self._task.training), int(self._task.episode))
+        with self._lock:
+            if not self._aggregate:
+                self._append_rows(meta, rows)
+            else:
+                for meta, values in self._aggregate.extend(meta, rows):
+                    self._append(meta, values)
+        if self._size >= self._max_rows or self.due(time.time()):
+            self.flush(wait=False)
+
+    def due(self, now):
+        """
+        Whether the flush interval has passed since the last flush.
+        """
+        return now >= self._last_flush + self._flush_interval
+
+    def flush(self, wait=True):
+        """
+        Pass the buffered rows to the writer. Unless disabled, block until
+        they are stored.
+        """
+        with self._lock:
+            self._last_flush = time.time()
+            rows = self._take()
+            if rows:
+                self._writer.write(self._handle, None, *rows)
+        if wait:
+            self._writer.wait()
+
+    def __del__(self):
+        # Hand the remaining rows of metrics that are dropped without a flush
+        # to the writer. This runs inside garbage collection, so it must
+        # neither block nor raise the errors stored for the next write.
+        if not hasattr(self, '_lock'):
+            return
+        try:
+            rows = self._take()
+            if rows:
+                self._writer.hand_off(self._handle, None, *rows)
+        except Exception:
+            pass
+
+    def _take(self):
+        if self._aggregate:
+            for meta, values in self._aggregate.drain():
+                self._append(meta, values)
+        if not self._size:
+            return None
+        meta = self._meta[:self._size].copy()
+        values = self._values[:self._size].copy()
+        self._size = 0
+        return meta, values
+
+    def _append(self, meta, values):
+        if self._size == len(self._meta):
+            self._grow()
+        self._meta[self._size] = meta
+        self._values[self._size] = values
+        self._size += 1
+
+    def _append_rows(self, meta, rows):
+        while self._size + len(rows) > len(self._meta):
+            self._grow()
+        stop = self._size + len(rows)
+        self._meta[self._size: stop] = meta
+        self._values[self._size: stop] = rows
+        self._size = stop
+
+    def _grow(self):
+        size = len(self._meta) + self._chunk
+        meta = np.zeros((size, len(self.META)), np.int64)
+        values = np.zeros(
+            (size,) + self._values.shape[1:], self._values.dtype)
+        meta[:self._size] = self._meta[:self._size]
+        values[:self._size] = self._values[:self._size]
+        self._meta, self._values = meta, values
 
     def _parse_columns(self, columns):
         if not isinstance(columns, (int, list, tuple)):
@@ -50,7 +177,7 @@ class Metric:
             columns = ['value_{}'.format(x) for x in range(columns)]
         if len(set(columns)) != len(columns):
             raise KeyError('column names must be unique')
-        reserved = 'id timestamp step epoch training episode'.split()
+        reserved = 'id timestamp step epoch training episode vector'.split()
         for column in columns:
             if column in reserved:
                 message = "can't use reserved column '{}'"
@@ -58,34 +185,3 @@ class Metric:
         if not columns:
             raise ValueError('need at least one column')
         return columns
-
-    def _parse_values(self, values):
-        if len(values) != len(self.columns):
-            message = 'need one value for each column, expected {} got {}'
-            raise ValueError(message.format(len(self.columns), len(values)))
-        values = [float(x) for x in values]
-        values = {k: v for k, v in zip(self.columns, values)}
-        return values
-
-    def _create_table(self, names):
-        metadata = sql.MetaData()
-        columns = [
-            sql.Column('id', mp.utility.Uuid, primary_key=True, default=uuid.uuid4),
-            sql.Column('timestamp', sql.DateTime, default=datetime.now),
-            sql.Column('step', sql.Integer),
-            sql.Column('epoch', sql.Integer),
-            sql.Column('training', sql.Boolean),
-            sql.Column('episode', sql.Integer)]
-        columns += [sql.Column(x, sql.Float) for x in names]
-        table = sql.Table(self.name, metadata, *columns)
-        metadata.create_all(self._engine)
-        return table
-
-    def _get_engine(self):
-        if not self._task.directory:
-            kwargs = dict(
-                connect_args={'check_same_thread': False},
-                poolclass=sql.pool.StaticPool)
-            return sql.create_engine('sqlite://', **kwargs)
-        filepath = self._task.directory.rstrip('/')
-        return sql.create_engine('sqlite:///{}/stats.db'.format(filepath))
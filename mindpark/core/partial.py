@@ -11,7 +11,9 @@ class Partial(Policy):
     to an above policy.
 
     Note: After forwarding an observation, you must forward a reward, before
-    continuing with the next observation.
+    continuing with the next observation. Instead of an observation, you may
+    forward None when the above policy ignores it. The same holds per
+    environment for the batched methods, which never forward None.
     """
 
     def __init__(self, task):
@@ -56,7 +58,7 @@ class Partial(Policy):
         pass
 
     def begin_episode(self, episode, training):
-        if self.above_task and self.above is None:
+        if self.validate and self.above_task and self.above is None:
             raise RuntimeError('must set above policy before simulation')
         super().begin_episode(episode, training)
 
@@ -32,6 +32,22 @@ class Policy(ABC):
         self.task = Proxy(task)
         self.random = np.random.RandomState()
         self.training = None
+        self._validate = True
+        self._state = State.initial
+
+    @property
+    def validate(self):
+        """
+        Whether the policy checks that its methods are called in the right
+        order and with valid observations. Sequential policies can skip these
+        checks for their steps, see `Sequential.optimize()`. Only change this
+        between episodes.
+        """
+        return self._validate
+
+    @validate.setter
+    def validate(self, validate):
+        self._validate = validate
         self._state = State.initial
 
     def begin_episode(self, episode, training):
@@ -40,27 +56,43 @@ class Policy(ABC):
         specifies whether the policy should learn during the episode or is just
         evaluated.
         """
-        self._assert_state(State.initial, State.end)
-        self._state = State.begin
+        if self._validate:
+            self._assert_state(State.initial, State.end)
+            self._state = State.begin
         self.training = training
 
     def end_episode(self):
         """
         Optional hook at the end of an episode.
         """
-        self._assert_state(State.begin, State.received)
-        self._state = State.end
+        if self._validate:
+            self._assert_state(State.begin, State.received)
+            self._state = State.end
         self.training = None
 
+    @property
+    def ignores(self):
+        """
+        Number of upcoming observations that this policy will not look at.
+        Below policies may pass None instead of those observations, so that
+        they can skip computing them.
+        """
+        return 0
+
     @abstractmethod
     def observe(self, observ):
         """
-        Process an observation and return an action.
+        Process an observation and return an action. The observation is None
+        if this policy declared to ignore it.
         """
+        if not self._validate:
+            return
         self._assert_state(State.begin, State.received)
         self._state = State.observed
         # message = '{} {}'.format(self.task.observs.high, observ)
         # assert self.task.observs.contains(observ), message
+        if observ is None:
+            return
         if not self.task.observs.contains(observ):
             message = '{} received an invalid observation'
             raise ValueError(message.format(self))
@@ -70,10 +102,45 @@ class Policy(ABC):
         """
         Receive a reward from the environment.
         """
+        if not self._validate:
+            return
         self._assert_state(State.observed)
         self._state = State.received
         assert reward is not None
 
+    def begin_episode_batch(self, index, episode, training):
+        """
+        Optional hook at the beginning of an episode of the environment at
+        the index of a batch of environments. Only needed for policies that
+        support the batched protocol, see `observe_batch()`. The protocol is
+        not validated.
+        """
+        pass
+
+    def end_episode_batch(self, index):
+        """
+        Optional hook at the end of an episode of the environment at the
+        index of a batch of environments.
+        """
+        pass
+
+    def observe_batch(self, indices, observs):
+        """
+        Process observations stacked along the first axis and return stacked
+        actions. The indices specify the environments the observations belong
+        to and may be a subset of the batch. Optional, policies supporting it
+        should keep their per environment state in arrays indexed by them.
+        """
+        message = '{} does not support batches'
+        raise NotImplementedError(message.format(type(self).__name__))
+
+    def receive_batch(self, indices, rewards, finals):
+        """
+        Receive stacked rewards for the environments at the indices.
+        """
+        message = '{} does not support batches'
+        raise NotImplementedError(message.format(type(self).__name__))
+
     def __repr__(self):
         return '<{}>'.format(type(self).__name__)
 
@@ -0,0 +1,114 @@
+import collections
+import functools
+import threading
+import time
+from mindpark.core.metric import Metric
+
+
+class Profiler:
+
+    """
+    Measure the time that policies spend in their methods. The time spent in
+    calls to other measured policies, usually the above policy, is not added
+    to the caller. Policies can be measured from multiple threads.
+    """
+
+    METHODS = ('begin_episode', 'observe', 'receive', 'end_episode')
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._metrics = {}
+
+    def install(self, policy, name):
+        """
+        Wrap the methods of the policy instance to measure them under the
+        specified name. Policies with the same name are measured together.
+        """
+        for method in self.METHODS:
+            original = getattr(type(policy), method).__get__(policy)
+            setattr(policy, method, self._wrap(original, name, method))
+
+    def uninstall(self, policy):
+        for method in self.METHODS:
+            policy.__dict__.pop(method, None)
+
+    @property
+    def timings(self):
+        """
+        Mapping from names and methods to the number of calls and the
+        cumulative duration in seconds, sorted by decreasing duration.
+        """
+        calls = collections.defaultdict(int)
+        durations = collections.defaultdict(float)
+        with self._lock:
+            threads = self._threads[:]
+        for thread_calls, thread_durations in threads:
+            for key, value in list(thread_calls.items()):
+                calls[key] += value
+            for key, value in list(thread_durations.items()):
+                durations[key] += value
+        keys = sorted(durations.keys(), key=lambda x: -durations[x])
+        return collections.OrderedDict(
+            (x, (calls[x], durations[x])) for x in keys)
+
+    def reset(self):
+        with self._lock:
+            for calls, durations in self._threads:
+                calls.clear()
+                durations.clear()
+
+    def format(self):
+        lines = ['{:<32} {:<14} {:>10} {:>10} {:>14}'.format(
+            'Step', 'Method', 'Calls', 'Total (s)', 'Per call (us)')]
+        for (name, method), (calls, duration) in self.timings.items():
+            lines.append('{:<32} {:<14} {:>10} {:>10.2f} {:>14.1f}'.format(
+                name, method, calls, duration, 1e6 * duration / calls))
+        return '\n'.join(lines)
+
+    def write(self, task):
+        """
+        Store the average duration per call in seconds of each method as
+        metrics of the task, one metric per name.
+        """
+        names = collections.defaultdict(dict)
+        for (name, method), (calls, duration) in self.timings.items():
+            names[name][method] = duration / calls
+        for name, durations in names.items():
+            if name not in self._metrics:
+                self._metrics[name] = Metric(
+                    task, 'profile/' + name, list(self.METHODS))
+            values = [durations.get(x, 0) for x in self.METHODS]
+            self._metrics[name](*values)
+        for metric in self._metrics.values():
+            metric.flush()
+
+    def _wrap(self, function, name, method):
+        key = name, method
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            calls, durations, nested = self._thread_state()
+            nested.append(0)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                inner = nested.pop()
+                if nested:
+                    nested[-1] += duration
+                calls[key] += 1
+                durations[key] += duration - inner
+
+        return wrapper
+
+    def _thread_state(self):
+        if not hasattr(self._local, 'state'):
+            calls = collections.defaultdict(int)
+            durations = collections.defaultdict(float)
+            self._local.state = calls, durations, []
+            with self._lock:
+                self._threads.append((calls, durations))
+        return self._local.state
@@ -7,6 +7,7 @@ class Sequential(Partial):
 
     def __init__(self, task):
         self._task = None
+        self._profiler = None
         self.steps = []
         super().__init__(task)
 
@@ -41,6 +42,31 @@ class Sequential(Partial):
         for below, step in zip(self.steps[:-1], self.steps[1:]):
             step.task = below.above_task
 
+    def optimize(self, enabled=True):
+        """
+        Only validate the protocol at the boundary of this policy and skip the
+        checks in all of its recursive steps. This saves the overhead of the
+        checks for every step of the chain at every time step. Only call this
+        between episodes.
+        """
+        for step in self.recursive_steps:
+            step.validate = not enabled
+
+    def profile(self, profiler):
+        """
+        Measure the time spent in this policy and each of its recursive steps
+        using the profiler. Can be called on an existing policy at any time;
+        steps added afterwards are not measured. Pass None to stop measuring.
+        """
+        steps = [self] + self.recursive_steps
+        for index, step in enumerate(steps):
+            if self._profiler:
+                self._profiler.uninstall(step)
+            if profiler:
+                name = '{}_{}'.format(index, type(step).__name__.lower())
+                profiler.install(step, name)
+        self._profiler = profiler
+
     @property
     def recursive_steps(self):
         flat, steps = [], self.steps[:]
@@ -67,6 +93,10 @@ class Sequential(Partial):
     def above_actions(self):
         pass
 
+    @property
+    def ignores(self):
+        return self._first.ignores
+
     def set_above(self, above):
         super().set_above(above)
         if self.steps:
@@ -90,6 +120,20 @@ class Sequential(Partial):
         super().receive(reward, final)
         self._first.receive(reward, final)
 
+    def begin_episode_batch(self, index, episode, training):
+        for policy in self.steps:
+            policy.begin_episode_batch(index, episode, training)
+
+    def end_episode_batch(self, index):
+        for policy in reversed(self.steps):
+            policy.end_episode_batch(index)
+
+    def observe_batch(self, indices, observs):
+        return self._first.observe_batch(indices, observs)
+
+    def receive_batch(self, indices, rewards, finals):
+        self._first.receive_batch(indices, rewards, finals)
+
     def __repr__(self):
         steps = ', '.join([type(x).__name__ for x in self.steps])
         return "<Sequential steps=[{}]>".format(steps)
@@ -0,0 +1,267 @@
+import json
+import os
+import struct
+import time
+import uuid
+from datetime import datetime
+import numpy as np
+import sqlalchemy as sql
+import mindpark as mp
+from mindpark.utility import ensure_directory
+
+
+META = ('step', 'epoch', 'training', 'episode')
+
+
+class SqliteStorage:
+
+    """
+    Store each metric as a table of the stats database in the directory, or
+    of an in-memory database without a directory. The writing methods are
+    called from the writer thread.
+
+    New tables use the lean layout when enabled: an integer row id, the time
+    as seconds since the epoch, and no index beyond the row id. The database
+    then uses write-ahead logging and only syncs at checkpoints. Existing
+    tables keep their layout. Vector metrics store each row as a single blob
+    of packed float32 values.
+    """
+
+    def __init__(self, directory, lean=False):
+        self.directory = directory
+        self.lean = lean
+        self.engine = self._create_engine(directory)
+        sql.event.listen(self.engine, 'connect', self._configure)
+        self._connection = None
+
+    def create(self, name, columns, vector=None):
+        """
+        Create the table if needed and return a handle for writing to it. For
+        vector metrics, pass their length and a single column name.
+        """
+        lean = self.lean_layout(name)
+        metadata = sql.MetaData()
+        if lean:
+            # The integer key aliases the SQLite rowid, so it needs no index
+            # of its own.
+            keys = [
+                sql.Column('id', sql.Integer, primary_key=True),
+                sql.Column('timestamp', sql.Float)]
+        else:
+            keys = [
+                sql.Column(
+                    'id', mp.utility.Uuid, primary_key=True,
+                    default=uuid.uuid4),
+                sql.Column('timestamp', sql.DateTime, default=datetime.now)]
+        keys += [
+            sql.Column('step', sql.Integer),
+            sql.Column('epoch', sql.Integer),
+            sql.Column('training', sql.Boolean),
+            sql.Column('episode', sql.Integer)]
+        type_ = sql.LargeBinary if vector else sql.Float
+        keys += [sql.Column(x, type_) for x in columns]
+        sql.Table(name, metadata, *keys)
+        metadata.create_all(self.engine)
+        statement = self._create_statement(name, columns, lean)
+        return statement, lean, bool(vector)
+
+    def lean_layout(self, name):
+        """
+        Whether the table uses the lean layout. Existing tables keep their
+        layout, new tables use the current setting.
+        """
+        inspector = sql.inspect(self.engine)
+        if name not in inspector.get_table_names():
+            return self.lean
+        columns = inspector.get_columns(name)
+        id_ = [x for x in columns if x['name'] == 'id'][0]
+        return isinstance(id_['type'], sql.Integer)
+
+    def write(self, batches):
+        """
+        Write a list of batches in one transaction. Each batch consists of a
+        handle, the timestamps or None to use the current time, an integer
+        array of meta data columns, and an array of values.
+        """
+        self._connection = self._connection or self.engine.connect()
+        # Insert through the database driver, so that rows can be passed as
+        # tuples rather than one dictionary per row.
+        with self._connection.begin():
+            cursor = self._connection.connection.cursor()
+            for handle, timestamps, meta, values in batches:
+                statement, lean, vector = handle
+                if vector:
+                    values = np.asarray(values, np.float32)
+                    values = [[x.tobytes() for x in values]]
+                else:
+                    values = values.T.tolist()
+                rows = self._rows(timestamps, meta.T.tolist(), values, lean)
+                cursor.executemany(statement, rows)
+            cursor.close()
+
+    def release(self):
+        """
+        Close the connection of the writer thread.
+        """
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _rows(timestamps, meta, values, lean):
+        # Takes lists of columns and yields the rows.
+        if timestamps is None:
+            timestamps = [time.time()] * len(meta[0])
+        else:
+            timestamps = np.asarray(timestamps, float).tolist()
+        if lean:
+            yield from zip(timestamps, *meta, *values)
+            return
+        format_ = '%Y-%m-%d %H:%M:%S.%f'
+        converted = {}
+        for row in zip(timestamps, *meta, *values):
+            if row[0] not in converted:
+                converted[row[0]] = datetime.fromtimestamp(
+                    row[0]).strftime(format_)
+            yield (uuid.uuid4().hex, converted[row[0]]) + row[1:]
+
+    @staticmethod
+    def _create_statement(name, columns, lean):
+        names = ['timestamp'] + list(META) + list(columns)
+        if not lean:
+            names.insert(0, 'id')
+        values = ', '.join(['?'] * len(names))
+        names = ', '.join('"{}"'.format(x) for x in names)
+        return 'INSERT INTO "{}" ({}) VALUES ({})'.format(name, names, values)
+
+    def _configure(self, connection, record):
+        if not self.lean or not self.directory:
+            return
+        cursor = connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+    @staticmethod
+    def _create_engine(directory):
+        if not directory:
+            kwargs = dict(
+                connect_args={'check_same_thread': False},
+                poolclass=sql.pool.StaticPool)
+            return sql.create_engine('sqlite://', **kwargs)
+        return sql.create_engine('sqlite:///{}/stats.db'.format(directory))
+
+
+class ColumnStorage:
+
+    """
+    Store each metric as one NumPy file per column in the metrics folder of
+    the directory. Rows are appended to the files in place. The headers have
+    a fixed size, so that the number of rows can be updated without moving
+    the data, and the files can be memory mapped using `np.load()`. A
+    manifest lists the metrics and their columns. Vector metrics store their
+    values in a single two dimensional float32 file.
+    """
+
+    FOLDER = 'metrics'
+    MANIFEST = 'manifest.json'
+    HEADER = 128
+    KEYS = (('timestamp', '<f8'),) + tuple(
+        (x, '|b1' if x == 'training' else '<i8') for x in META)
+
+    def __init__(self, directory):
+        if not directory:
+            raise ValueError('column storage needs a directory')
+        self.directory = os.path.join(directory, self.FOLDER)
+        ensure_directory(self.directory)
+        self._manifest = self.read_manifest(self.directory) or {}
+
+    @classmethod
+    def read_manifest(cls, directory):
+        """
+        Mapping from metric names to their file prefix and value columns, or
+        None if the directory contains no manifest.
+        """
+        filepath = os.path.join(directory, cls.MANIFEST)
+        if not os.path.isfile(filepath):
+            return None
+        with open(filepath) as file_:
+            return json.load(file_)
+
+    @classmethod
+    def filepath(cls, directory, prefix, column):
+        return os.path.join(directory, '{}.{}.npy'.format(prefix, column))
+
+    def create(self, name, columns, vector=None):
+        """
+        Create the files of the metric if needed and return a handle for
+        writing to them. For vector metrics, pass their length and a single
+        column name.
+        """
+        columns = list(columns)
+        if name in self._manifest:
+            entry = self._manifest[name]
+            if entry['columns'] != columns or entry.get('vector') != vector:
+                message = "metric '{}' exists with different columns"
+                raise KeyError(message.format(name))
+            return entry['prefix'], columns, vector
+        prefix = str(len(self._manifest))
+        shapes = [(x, y, (0,)) for x, y in self.KEYS]
+        if vector:
+            shapes += [(columns[0], '<f4', (0, vector))]
+        else:
+            shapes += [(x, '<f8', (0,)) for x in columns]
+        for column, dtype, shape in shapes:
+            path = self.filepath(self.directory, prefix, column)
+            with open(path, 'wb') as file_:
+                self._write_header(file_, dtype, shape)
+        self._manifest[name] = dict(prefix=prefix, columns=columns)
+        if vector:
+            self._manifest[name]['vector'] = vector
+        self._write_manifest()
+        return prefix, columns, vector
+
+    def write(self, batches):
+        """
+        Append a list of batches, see `SqliteStorage.write()`.
+        """
+        for (prefix, columns, vector), timestamps, meta, values in batches:
+            if timestamps is None:
+                timestamps = np.full(len(meta), time.time())
+            arrays = [timestamps] + list(meta.T)
+            arrays += [values] if vector else list(values.T)
+            names = [x for x, _ in self.KEYS] + columns
+            for column, array in zip(names, arrays):
+                path = self.filepath(self.directory, prefix, column)
+                self._append(path, array)
+
+    def release(self):
+        pass
+
+    def _append(self, path, array):
+        with open(path, 'r+b') as file_:
+            np.lib.format.read_magic(file_)
+            shape, _, dtype = np.lib.format.read_array_header_1_0(file_)
+            # Rows beyond the header count are left over from an interrupted
+            # write and get overwritten.
+            row = int(np.prod(shape[1:])) * dtype.itemsize
+            file_.seek(self.HEADER + shape[0] * row)
+            file_.write(np.ascontiguousarray(array, dtype).tobytes())
+            file_.truncate()
+            file_.seek(0)
+            shape = (shape[0] + len(array),) + shape[1:]
+            self._write_header(file_, dtype, shape)
+
+    def _write_header(self, file_, dtype, shape):
+        header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}"
+        header = header.format(np.dtype(dtype).str, tuple(shape))
+        header = header.ljust(self.HEADER - 11) + '\n'
+        file_.write(np.lib.format.magic(1, 0))
+        file_.write(struct.pack('<H', len(header)))
+        file_.write(header.encode('latin1'))
+
+    def _write_manifest(self):
+        filepath = os.path.join(self.directory, self.MANIFEST)
+        with open(filepath + '.tmp', 'w') as file_:
+            json.dump(self._manifest, file_, indent=2, sort_keys=True)
+        os.replace(filepath + '.tmp', filepath)
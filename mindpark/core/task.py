@@ -1,3 +1,4 @@
+import numpy as np
 from mindpark.utility import Counter
 
 
@@ -7,11 +8,14 @@ class Task:
     A specification of a task that can be simulated. Will be provided to the
     algorithm to access the environment interface, the current time step, the
     maximum time steps, and a directory to store results like checkpoints in.
+    The dtype is the floating point type that steps convert observations to
+    when normalizing them, and that experience and models work with. Before
+    that, steps keep the type of the observations they receive.
     """
 
     def __init__(
             self, observs, actions, directory, steps, epochs, training,
-            step=None, epoch=None, episode=None):
+            step=None, epoch=None, episode=None, dtype=np.float32):
         required = (observs, actions, steps, epochs, training)
         assert all(x is not None for x in required)
         self.observs = observs
@@ -23,3 +27,4 @@ class Task:
         self.step = step or Counter()
         self.epoch = epoch or Counter()
         self.episode = episode or Counter()
+        self.dtype = dtype
@@ -0,0 +1,223 @@
+import atexit
+import collections
+import queue
+import threading
+import time
+import weakref
+from mindpark.core.storage import SqliteStorage, ColumnStorage
+
+
+class MetricWriter:
+
+    """
+    Write the rows of all metrics that share a directory to its storage.
+    Batches are written in order by a background thread using a single
+    connection. The thread stops when idle and is restarted on demand. The
+    queue of pending batches is bounded, so that producers block when writing
+    falls behind. Use `MetricWriter.get()` to obtain the writer of a
+    directory.
+
+    A scheduler thread periodically flushes the metrics of all shared
+    writers whose flush interval has passed, so that rows of metrics that
+    are no longer called get stored as well. Remaining rows are flushed when
+    the interpreter exits. Rows handed off during garbage collection are
+    moved to the queue by the scheduler or the next wait.
+    """
+
+    BACKENDS = {'sqlite': SqliteStorage, 'columns': ColumnStorage}
+    TICK = 1
+
+    _writers = {}
+    _lock = threading.Lock()
+    _scheduler = None
+
+    @classmethod
+    def get(cls, directory, lean=None, backend=None):
+        """
+        Return the writer for the directory, creating it if needed. Tasks
+        without a directory share an in-memory database. Specify lean to
+        choose the layout of database tables created from now on. Specify
+        the backend before creating metrics in the directory.
+        """
+        directory = directory and directory.rstrip('/')
+        with cls._lock:
+            if directory not in cls._writers:
+                cls._writers[directory] = cls(directory, backend=backend)
+            writer = cls._writers[directory]
+            if backend and backend != writer.backend:
+                writer._change_backend(backend)
+            if lean is not None and writer.backend == 'sqlite':
+                writer.storage.lean = lean
+            return writer
+
+    @classmethod
+    def flush_all(cls):
+        with cls._lock:
+            writers = list(cls._writers.values())
+        for writer in writers:
+            writer.flush()
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            writers = list(cls._writers.values())
+            cls._writers.clear()
+        for writer in writers:
+            writer.close()
+
+    def __init__(self, directory, capacity=64, idle=1, backend=None):
+        self.directory = directory
+        self.backend = backend or 'sqlite'
+        self.storage = self.BACKENDS[self.backend](directory)
+        self._metrics = weakref.WeakSet()
+        self._queue = queue.Queue(capacity)
+        self._pending = collections.deque()
+        self._idle = idle
+        self._database = threading.Lock()
+        self._state = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._error = None
+
+    def register(self, metric):
+        """
+        Remember the metric so that its buffer gets flushed with the writer
+        and by the scheduler.
+        """
+        self._metrics.add(metric)
+        with type(self)._lock:
+            if not type(self)._scheduler:
+                thread = threading.Thread(target=self._schedule, daemon=True)
+                type(self)._scheduler = thread
+                thread.start()
+
+    def create(self, name, columns, vector=None):
+        """
+        Prepare the storage for a metric and return a handle to write to it.
+        """
+        with self._database:
+            return self.storage.create(name, columns, vector)
+
+    def write(self, handle, timestamps, meta, values):
+        """
+        Queue rows for the metric of the handle. Timestamps can be None to
+        use the time of writing. Blocks while the queue is full.
+        """
+        self._raise_error()
+        if self._closed:
+            raise RuntimeError('metric writer is closed')
+        self._enqueue((handle, timestamps, meta, values))
+
+    def hand_off(self, handle, timestamps, meta, values):
+        """
+        Keep rows to queue later, without blocking, taking locks, or raising
+        stored errors. Used during garbage collection. Rows handed off after
+        the writer is closed are dropped.
+        """
+        if not self._closed:
+            self._pending.append((handle, timestamps, meta, values))
+
+    def wait(self):
+        """
+        Block until all queued batches are written.
+        """
+        self._requeue()
+        self._queue.join()
+        self._raise_error()
+
+    def flush(self):
+        """
+        Queue the buffered rows of all registered metrics and wait until they
+        are written.
+        """
+        for metric in list(self._metrics):
+            metric.flush(wait=False)
+        self.wait()
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+
+    @classmethod
+    def _schedule(cls):
+        while True:
+            time.sleep(cls.TICK)
+            # Stop when no metrics are left, so that registering starts a new
+            # scheduler. Decide while holding the lock for the same reason.
+            with cls._lock:
+                writers = list(cls._writers.values())
+                if not any(len(x._metrics) or x._pending for x in writers):
+                    cls._scheduler = None
+                    break
+            now = time.time()
+            for writer in writers:
+                writer._requeue()
+                for metric in list(writer._metrics):
+                    if not metric.due(now):
+                        continue
+                    try:
+                        metric.flush(wait=False)
+                    except Exception as e:
+                        # Raise in the thread that uses the writer next.
+                        writer._error = writer._error or e
+
+    def _run(self):
+        while True:
+            try:
+                batches = [self._queue.get(timeout=self._idle)]
+            except queue.Empty:
+                # Producers start a new thread if they find none after
+                # queueing, so only stop while holding the lock.
+                with self._state:
+                    if self._queue.empty():
+                        with self._database:
+                            self.storage.release()
+                        self._thread = None
+                        break
+                continue
+            # Write all batches that are already waiting in one transaction.
+            while not self._queue.empty():
+                batches.append(self._queue.get())
+            try:
+                with self._database:
+                    self.storage.write(batches)
+            except Exception as e:
+                self._error = e
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def _enqueue(self, batch):
+        self._queue.put(batch)
+        with self._state:
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _requeue(self):
+        while True:
+            try:
+                batch = self._pending.popleft()
+            except IndexError:
+                break
+            self._enqueue(batch)
+
+    def _change_backend(self, backend):
+        if len(self._metrics):
+            message = "can't change backend of '{}' after creating metrics"
+            raise RuntimeError(message.format(self.directory))
+        self.wait()
+        self.backend = backend
+        self.storage = self.BACKENDS[backend](self.directory)
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error:
+            raise error
+
+
+atexit.register(MetricWriter.close_all)
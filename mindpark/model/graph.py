@@ -1,7 +1,8 @@
 import os
 from threading import Lock
 import tensorflow as tf
-from mindpark.utility import OptionalContext, ensure_directory
+from mindpark.utility import (
+    OptionalContext, ReadWriteLock, ensure_directory)
 
 
 class Graph:
@@ -10,16 +11,21 @@ class Graph:
     Interface for a TensorFlow graph. Supports saving, loading, and restoring
     the whole graph from disk. Nodes are added by name and will be added to
     graph collections internally, so that they are available after loading.
+
+    Runs can happen from multiple threads at the same time, only writes are
+    mutually exclusive. With locking, writes also exclude all runs, so that
+    reads never see partially assigned weights.
     """
 
-    def __init__(self, threads=None, locking=True):
+    def __init__(self, threads=None, locking=False):
         self._graph = tf.Graph()
         config = threads and tf.ConfigProto(
             intra_op_parallelism_threads=threads)
         self._sess = tf.Session('', self._graph, config)
         self._saver = None
         self._scope = None
-        self._lock = OptionalContext(locking and Lock())
+        self._lock = locking and ReadWriteLock()
+        self._write_lock = Lock()
 
     def __enter__(self):
         self._assert_modifiable()
@@ -80,9 +86,10 @@ class Graph:
             raise KeyError(name + ' does not exist in the graph')
         return self._graph.get_collection(name)[0]
 
-    def __call__(self, ops, data=None):
+    def __call__(self, ops, data=None, write=False):
         """
-        Run one or more operations on the graph
+        Run one or more operations on the graph. Operations that assign
+        variables should be marked as write.
         """
         self._assert_finalized()
         single = not isinstance(ops, (tuple, list))
@@ -94,7 +101,7 @@ class Graph:
         data = data or {}
         data = {self[k] if isinstance(k, str) else k: v
                 for k, v in data.items()}
-        with self._lock:
+        with self._context(write):
             results = self._sess.run(ops, data)
         if single:
             results = results[0]
@@ -110,6 +117,11 @@ class Graph:
             nodes[key[len(prefix):]] = self[key]
         return nodes
 
+    def _context(self, write):
+        if self._lock:
+            return self._lock.write() if write else self._lock.read()
+        return OptionalContext(write and self._write_lock)
+
     def _assert_modifiable(self):
         if self._graph.finalized:
             raise RuntimeError('the graph cannot be modified anymore')
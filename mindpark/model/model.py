@@ -12,7 +12,8 @@ class Model:
     """
 
     def __init__(
-            self, creator=None, load_path=None, threads=None, clip_delta=10):
+            self, creator=None, load_path=None, threads=None, clip_delta=10,
+            locking=False):
         """
         Create a new model. Either load_path or creator must be specified.
 
@@ -22,9 +23,14 @@ class Model:
                 if load_path is not specified. Will be executed with the graph
                 of the model as default graph. After this function, no further
                 operations can be added to the graph.
+            locking (bool, optional): Prevent computations while weights or
+                options are assigned. Otherwise, only assignments are
+                mutually exclusive. Training then computes the gradients
+                alongside other computations and only locks to apply them.
         """
         self._clip_delta = clip_delta
-        self._graph = Graph(threads)
+        self._locking = locking
+        self._graph = Graph(threads, locking)
         self._optimizer = None
         if load_path:
             try:
@@ -71,10 +77,11 @@ class Model:
         return self._graph('option/' + name)
 
     def set_option(self, name, value):
-        self._graph('option_set/' + name, {'option_input/' + name: value})
+        self._graph(
+            'option_set/' + name, {'option_input/' + name: value}, True)
 
     def reset_option(self, name):
-        self._graph('option_set/' + name)
+        self._graph('option_set/' + name, write=True)
 
     def add_output(self, name, node):
         self._graph['output/' + name] = node
@@ -89,11 +96,18 @@ class Model:
         node = tf.reduce_sum(node)
         self._graph['cost/' + name] = node
         clip = self._clip_delta
+        grad_vars = []
         for gradient, variable in self._optimizer.compute_gradients(node):
             if gradient is None:
                 continue
             clipped = tf.clip_by_value(gradient, -clip, clip)
             self._graph['delta/' + name + '/' + variable.name] = clipped
+            grad_vars.append((clipped, variable))
+        # Compute, clip, and apply the gradients in a single run, so that
+        # they do not need to be copied out of TensorFlow and fed back.
+        with tf.control_dependencies([node]):
+            train = self._optimizer.apply_gradients(grad_vars)
+        self._graph['train/' + name] = train
         return node
 
     def has_cost(self, name):
@@ -101,11 +115,20 @@ class Model:
 
     def train(self, cost, batch=None, epochs=1, **data):
         costs = []
-        for batch in self._chunks(data, batch, epochs):
-            # TODO: See if training directly is more efficient.
-            delta, cost = self.delta(cost, **data)
-            self.apply(delta)
-            costs.append(cost)
+        for chunk in self._chunks(data, batch, epochs):
+            if self._locking or 'train/' + cost not in self._graph:
+                # The fused operation would exclude all computations for the
+                # whole training step. Models stored before it lack it.
+                delta, value = self.delta(cost, **chunk)
+                self.apply(delta)
+                costs.append(value)
+                continue
+            chunk, _ = self._prepare_data(chunk)
+            value, _ = self._graph(
+                ['cost/' + cost, 'train/' + cost], chunk, True)
+            if not np.isfinite(value):
+                print('the cost measure diverged')
+            costs.append(value)
         return sum(costs) / len(costs)
 
     def compute(self, output, **data):
@@ -132,7 +155,7 @@ class Model:
         self._validate_weights(weights)
         feed = {'set_weight_input/' + name: value
                 for name, value in weights.items()}
-        self._graph(['set_weight/' + x for x in weights], feed)
+        self._graph(['set_weight/' + x for x in weights], feed, True)
 
     def delta(self, cost, **data):
         data, _ = self._prepare_data(data)
@@ -150,7 +173,7 @@ class Model:
         self._validate_weights(delta)
         feed = {'apply_delta_input/' + name: value
                 for name, value in delta.items()}
-        self._graph('apply_delta', feed)
+        self._graph('apply_delta', feed, True)
 
     def _create_set_weight(self):
         for var in self._graph.weights:
@@ -173,7 +196,10 @@ class Model:
                 raise KeyError('unrecognized weight name ' + name)
 
     def _prepare_data(self, data):
-        data = {k: np.array(v) for k, v in data.items()}
+        # Convert to the types of the inputs once, so that TensorFlow does not
+        # need to convert the data on every call.
+        data = {
+            k: np.asarray(v, self._input_dtype(k)) for k, v in data.items()}
         for name, values in data.items():
             if not np.isfinite(values).all():
                 raise ValueError('non finite values in training input ' + name)
@@ -185,13 +211,17 @@ class Model:
             data = {k: np.expand_dims(v, 0) for k, v in data.items()}
         return data, single
 
+    def _input_dtype(self, name):
+        return self._graph['input/' + name].dtype.as_numpy_dtype
+
     def _chunks(self, data, size=None, epochs=1):
         for _ in range(epochs):
             if not size:
                 yield data
                 continue
-            for index in range(0, len(data), size):
-                yield {k: v[index: index + size] for k, v in data}
+            length = len(next(iter(data.values())))
+            for index in range(0, length, size):
+                yield {k: v[index: index + size] for k, v in data.items()}
 
     def __str__(self):
         string = ''
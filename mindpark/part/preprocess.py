@@ -10,10 +10,10 @@ def default(task, config):
     policy.add(mp.step.Image)
     if config.noop_max:
         policy.add(mp.step.RandomStart, config.noop_max)
-    if config.frame_skip > 1:
-        policy.add(mp.step.Skip, config.frame_skip)
     if config.frame_max:
         policy.add(mp.step.Maximum, config.frame_max)
+    if config.frame_skip > 1:
+        policy.add(mp.step.Skip, config.frame_skip)
     if config.history > 1:
         channels = policy.above_task.observs.shape[-1]
         policy.add(mp.step.Grayscale, (0.299, 0.587, 0.114)[:channels])
@@ -34,10 +34,10 @@ def dqn_2015(task, config=None):
     policy = mp.Sequential(task)
     policy.add(mp.step.Image)
     policy.add(mp.step.RandomStart, 30)
-    policy.add(mp.step.Skip, 4)
     policy.add(mp.step.Maximum, 2)
+    policy.add(mp.step.Skip, 4)
     policy.add(mp.step.Grayscale, (0.299, 0.587, 0.114))
-    policy.add(mp.step.Subsample, (2, 2))
+    policy.add(mp.step.Resize, (84, 84))
     policy.add(mp.step.History, 4)
     policy.add(mp.step.Normalize)
     policy.add(mp.step.ClampReward)
@@ -6,13 +6,15 @@ class RingBuffer:
     """
     Ring buffer holding tuples of Numpy matrices that are stored column wise.
     Supports advanced slicing and sliced assignment. Converts None values to
-    arrays of the target column size holding nan values.
+    arrays of the target column size holding nan values. The columns use the
+    specified floating point type.
     """
 
-    def __init__(self, capacity, shapes):
+    def __init__(self, capacity, shapes, dtype=np.float32):
         self._capacity = int(capacity)
         self._shapes = tuple(tuple(x) for x in shapes)
-        self._buffers = tuple(np.zeros((int(capacity),) + x)
+        self._dtype = dtype
+        self._buffers = tuple(np.zeros((int(capacity),) + x, dtype)
                               for x in self._shapes)
         self._head = 0
         self._tail = 0
@@ -37,7 +39,7 @@ class RingBuffer:
         assert len(transition) == len(self._buffers)
         for element, shape in zip(transition, self._shapes):
             if element is not None:
-                element = np.array(element)
+                element = np.asarray(element)
                 assert element.shape == shape
         for element, buffer in zip(transition, self._buffers):
             buffer[self.tail % self._capacity] = element
@@ -98,7 +100,7 @@ class RingBuffer:
         return key % self._capacity
 
     def _nans(self, shape):
-        array = np.empty(shape)
+        array = np.empty(shape, self._dtype)
         array.fill(np.nan)
         return array
 
@@ -111,8 +113,8 @@ class Sequential(RingBuffer):
     elements.
     """
 
-    def __init__(self, capacity, shapes, random=None):
-        super().__init__(capacity, shapes)
+    def __init__(self, capacity, shapes, random=None, dtype=np.float32):
+        super().__init__(capacity, shapes, dtype)
         self._random = random or np.random.RandomState()
 
     def batch(self, amount):
@@ -138,8 +140,10 @@ class Random(RingBuffer):
     currently hold elements. Exceeding the capacity frees the oldest elements.
     """
 
-    def __init__(self, capacity, shapes, random=None, replace=False):
-        super().__init__(capacity, shapes)
+    def __init__(
+            self, capacity, shapes, random=None, replace=False,
+            dtype=np.float32):
+        super().__init__(capacity, shapes, dtype)
         self._random = random or np.random.RandomState()
         self._replace = replace
 
@@ -1,3 +1,4 @@
 from .scalar import Scalar
 from .histogram import Histogram
 from .lines import Lines
+from .downsample import lttb, envelope, sample
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def lttb(domain, values, points):
+    """
+    Indices of the points that preserve the shape of a line, using the
+    Largest-Triangle-Three-Buckets algorithm. The domain must be sorted. The
+    first and last points are always kept.
+    """
+    if points >= len(domain) or points < 3:
+        return np.arange(len(domain))
+    # Buckets between the first and last point with about equal counts.
+    edges = np.linspace(1, len(domain) - 1, points - 1).astype(int)
+    selected = np.empty(points, int)
+    selected[0], selected[-1] = 0, len(domain) - 1
+    for index in range(points - 2):
+        start, stop = edges[index], edges[index + 1]
+        if index + 2 < len(edges):
+            following = slice(stop, edges[index + 2])
+            target = domain[following].mean(), values[following].mean()
+        else:
+            target = domain[-1], values[-1]
+        last = selected[index]
+        # Twice the area of the triangles with the last selected point and
+        # the average of the next bucket.
+        area = np.abs(
+            (domain[last] - target[0]) * (values[start: stop] - values[last]) -
+            (domain[last] - domain[start: stop]) * (target[1] - values[last]))
+        selected[index + 1] = start + np.argmax(area)
+    return selected
+
+
+def envelope(domain, values, columns):
+    """
+    Sorted indices of the minimum and maximum value within each of the
+    columns that split the domain into equal widths.
+    """
+    span = domain.max() - domain.min()
+    column = (domain - domain.min()) / (span or 1) * columns
+    column = np.minimum(column.astype(int), columns - 1)
+    # A stable sort is fast for domains that are already sorted.
+    order = np.argsort(column, kind='stable')
+    column, values = column[order], values[order]
+    changes = np.diff(column, prepend=-1) != 0
+    starts = np.flatnonzero(changes)
+    group = np.cumsum(changes) - 1
+    indices = []
+    for reduce_ in (np.fmin, np.fmax):
+        extremes = reduce_.reduceat(values, starts)
+        matches = np.flatnonzero(values == extremes[group])
+        _, first = np.unique(group[matches], return_index=True)
+        indices.append(order[matches[first]])
+    return np.unique(np.concatenate(indices))
+
+
+def sample(domain, values, points, seed=0):
+    """
+    Sorted indices of about the target number of scattered points. The
+    envelope over a few columns keeps the outline of the points, and uniform
+    samples make up most of the target to keep their density.
+    """
+    if points >= len(domain):
+        return np.arange(len(domain))
+    keep = envelope(domain, values, max(1, points // 32))
+    random = np.random.RandomState(seed)
+    count = max(0, points - len(keep))
+    others = random.choice(len(domain), count, replace=False)
+    return np.union1d(keep, others)
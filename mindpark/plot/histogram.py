@@ -1,6 +1,7 @@
 import numpy as np
 from matplotlib import cm
-from mindpark.utility import aggregate, add_color_bar
+from mindpark.utility import (
+    aggregate, add_color_bar, bin_borders, count_categories)
 
 
 class Histogram:
@@ -10,17 +11,28 @@ class Histogram:
         self._normalize = normalize
 
     def __call__(self, ax, domain, count):
+        """
+        Plot the mean of the count rows over the domain. Alternatively, pass
+        a vector of category indices to plot how often each of them occurs.
+        """
         assert len(domain) == len(count)
         assert domain[0] < domain[-1]
-        ax.set_axis_bgcolor(cm.get_cmap('viridis')(0))
+        ax.set_facecolor(cm.get_cmap('viridis')(0))
         order = np.argsort(domain)
         domain, count = domain[order], count[order]
         resolution = min(len(domain), self._resolution)
-        borders = np.linspace(domain[0], domain[-1], resolution)
-        borders = np.digitize(borders, domain)
-        groups = aggregate(count, borders, lambda x: np.mean(x, axis=0))
-        self._plot_grid(ax, domain[borders - 1], groups)
-        ax.set_yticks(np.arange(count.shape[1]))
+        borders = bin_borders(domain, resolution - 1)
+        if count.ndim == 1:
+            categories = count.max() + 1
+            groups = count_categories(count, borders, categories)
+            sizes = aggregate(count, borders, 'count')[:, None]
+            with np.errstate(invalid='ignore'):
+                groups = groups / sizes
+        else:
+            categories = count.shape[1]
+            groups = aggregate(count, borders, 'mean')
+        self._plot_grid(ax, domain, groups)
+        ax.set_yticks(np.arange(categories))
 
     def _plot_grid(self, ax, domain, cells):
         extent = [domain.min(), domain.max(), -.5, cells.shape[1] - .5]
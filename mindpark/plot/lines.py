@@ -1,5 +1,6 @@
 import numpy as np
-from mindpark.utility import aggregate
+from mindpark.plot.downsample import lttb
+from mindpark.utility import aggregate, bin_borders
 
 
 class Lines:
@@ -10,9 +11,16 @@ class Lines:
     LEGEND = dict(loc='best', fontsize='medium', labelspacing=0, numpoints=1)
     AREA = dict(alpha=0.2)
 
-    def __init__(self, resolution=20, legend=True):
+    """
+    Plot lines over a shared domain. With a resolution, each line is binned
+    into its median and a band between the 10th and 90th percentiles.
+    Without, the raw line is downsampled to the target number of points.
+    """
+
+    def __init__(self, resolution=20, legend=True, points=1000):
         self._resolution = resolution
         self._legend = legend
+        self._points = points
 
     def __call__(self, ax, domains, lines):
         assert domains.keys() == lines.keys()
@@ -36,20 +44,28 @@ class Lines:
     def _plot_line(self, ax, domain, line, label, color, marker):
         order = np.argsort(domain)
         domain, line = domain[order], line[order]
-
-        borders = np.linspace(domain[0], domain[-1], self._resolution)
-        borders = np.digitize(borders, domain)
-        domain = np.linspace(domain[0], domain[-1], len(borders) - 1)
-        lower_ = aggregate(line, borders, lambda x: np.percentile(x, 10, 0)[0])
-        middle = aggregate(line, borders, lambda x: np.percentile(x, 50, 0)[0])
-        upper_ = aggregate(line, borders, lambda x: np.percentile(x, 90, 0)[0])
-
-        ax.fill_between(
-            domain, upper_, lower_, facecolor=color, edgecolor=color,
-            **self.AREA)
+        line = line.reshape((len(line), -1))[:, 0]
+        if self._resolution:
+            domain, lower_, middle, upper_ = self._bin(domain, line)
+            ax.fill_between(
+                domain, upper_, lower_, facecolor=color, edgecolor=color,
+                **self.AREA)
+        else:
+            middle = line
+            if self._points:
+                indices = lttb(domain, line, self._points)
+                domain, middle = domain[indices], line[indices]
         ax.plot(
             domain, middle, c=color, label=label)
 
+    def _bin(self, domain, line):
+        borders = bin_borders(domain, self._resolution - 1)
+        filled = np.diff(borders) > 0
+        domain = np.linspace(domain[0], domain[-1], len(borders) - 1)
+        lower_, middle, upper_ = aggregate(line, borders, (10, 50, 90))
+        return (
+            domain[filled], lower_[filled], middle[filled], upper_[filled])
+
     def _plot_legend(self, ax):
         leg = ax.legend(**self.LEGEND)
         leg.get_frame().set_edgecolor('white')
@@ -1,13 +1,25 @@
 import numpy as np
+from mindpark.plot.downsample import sample
 from mindpark.utility import add_color_bar
 
 
 class Scalar:
 
+    """
+    Plot the density of scattered values. Beyond the target number of points,
+    a subsample that keeps the outline and density is plotted.
+    """
+
     HEXBIN = dict(gridsize=100, cmap='viridis', bins='log')
 
+    def __init__(self, points=20000):
+        self._points = points
+
     def __call__(self, ax, domain, line):
         extent = self._get_limits(domain, line)
+        if self._points:
+            indices = sample(domain, line, self._points)
+            domain, line = domain[indices], line[indices]
         img = ax.hexbin(domain, line, extent=extent, **self.HEXBIN)
         add_color_bar(ax, img).set_ticks([])
 
@@ -24,6 +24,15 @@ def parse_args(args):
     parser.add_argument(
         '-x', '--dry-run', action='store_true', default=False,
         help='do not store any results')
+    parser.add_argument(
+        '--profile', action='store_true', default=False,
+        help='measure and print the time spent in each step every epoch')
+    parser.add_argument(
+        '--lean-stats', action='store_true', default=False,
+        help='store new metrics in a faster and smaller database layout')
+    parser.add_argument(
+        '--stats-backend', choices=['sqlite', 'columns'], default='sqlite',
+        help='store metrics in a database or in appended NumPy columns')
     args = parser.parse_args(args)
     return args
 
@@ -32,7 +41,9 @@ def main(args):
     color_stack_trace()
     args = parse_args(args)
     directory = (not args.dry_run) and args.directory
-    benchmark = Benchmark(directory, args.parallel, args.videos)
+    benchmark = Benchmark(
+        directory, args.parallel, args.videos, args.profile,
+        args.lean_stats, args.stats_backend)
     logging.getLogger('gym').setLevel(logging.WARNING)
     benchmark(args.definition)
 
@@ -5,7 +5,7 @@ import time
 from threading import Lock
 import gym
 from concurrent.futures import ThreadPoolExecutor
-from mindpark.core import Task
+from mindpark.core import Task, MetricWriter
 from mindpark.utility import print_headline, dump_yaml
 from mindpark.run.definition import Definition
 from mindpark.run.job import Job
@@ -18,12 +18,17 @@ class Benchmark:
     statistics and recordings in the experiment directory.
     """
 
-    def __init__(self, directory=None, parallel=1, videos=0):
+    def __init__(
+            self, directory=None, parallel=1, videos=0, profile=False,
+            lean_stats=False, stats_backend='sqlite'):
         if directory:
             directory = os.path.abspath(os.path.expanduser(directory))
         self._directory = directory
         self._parallel = parallel
         self._videos = videos
+        self._profile = profile
+        self._lean_stats = lean_stats
+        self._stats_backend = stats_backend
         self._lock = Lock()
 
     def __call__(self, definition):
@@ -62,6 +67,9 @@ class Benchmark:
         directory = self._task_directory(
             experiment, env_name, algo_def.name, repeat, definition.repeats)
         observs, actions = self._determine_interface(env_name)
+        if directory:
+            MetricWriter.get(
+                directory, self._lean_stats, self._stats_backend)
         train = Task(
             observs, actions, directory,
             definition.epochs * algo_def.train_steps,
@@ -72,7 +80,8 @@ class Benchmark:
             definition.epochs + 1, False)
         prefix = '{} on {} ({}):'.format(algo_def.name, env_name, repeat)
         return Job(
-            train, test, env_name, algo_def, prefix, self._videos, self._lock)
+            train, test, env_name, algo_def, prefix, self._videos, self._lock,
+            self._profile)
 
     def _start_experiment(self, name):
         print_headline('Start experiment', style='=')
@@ -1,4 +1,5 @@
 import os
+import sys
 import traceback
 import mindpark as mp
 from mindpark.run.gym_env import GymEnv
@@ -8,7 +9,7 @@ class Job:
 
     def __init__(
             self, train_task, test_task, env_name, algo_def, prefix,
-            videos=False, lock=None):
+            videos=False, lock=None, profile=False):
         self._train_task = train_task
         self._test_task = test_task
         self._task = mp.utility.Proxy(train_task)
@@ -20,6 +21,7 @@ class Job:
         self._remaining_videos = None
         self._envs = []
         self._lock = mp.utility.OptionalContext(lock)
+        self._profiler = profile and mp.Profiler()
 
     def __call__(self):
         for score in self:
@@ -33,8 +35,12 @@ class Job:
         except Exception as e:
             self._handle_error(e)
         finally:
-            for env in self._envs:
-                env.close()
+            try:
+                for env in self._envs:
+                    env.close()
+            finally:
+                # Store remaining metric rows, also when the job failed.
+                mp.MetricWriter.get(self._task.directory).flush()
 
     def _execute(self):
         self._task.directory and mp.utility.dump_yaml(
@@ -67,6 +73,8 @@ class Job:
         self._task.change(self._train_task)
         training()
         algorithm.end_epoch()
+        if self._profiler:
+            self._report_profile()
         return score
 
     def _create_algorithm(self):
@@ -92,6 +100,10 @@ class Job:
         combined = mp.Sequential(policy.task)
         combined.add(mp.step.Score)
         combined.add(policy)
+        if sys.flags.optimize:
+            combined.optimize()
+        if self._profiler:
+            combined.profile(self._profiler)
         return combined
 
     def _print_score(self, score):
@@ -104,6 +116,14 @@ class Job:
             args = self._task.epoch, self._train_task.step, score
             print(self._prefix, message.format(*args))
 
+    def _report_profile(self):
+        with self._lock:
+            message = 'Profile of epoch {}:'.format(self._task.epoch)
+            print(self._prefix, message)
+            print(self._profiler.format())
+        self._profiler.write(self._task)
+        self._profiler.reset()
+
     def _video_callback(self, ignore):
         if not self._remaining_videos or self._task.training:
             return False
@@ -1,6 +1,7 @@
 import os
 import sys
 import argparse
+from mindpark.stats.follow import Follow
 from mindpark.stats.stats import Stats
 from mindpark.utility import get_subdirs
 
@@ -23,10 +24,22 @@ def parse_args(args):
         help='names of the metrics to display; defaults to all metrics')
     parser.add_argument(
         '-f', '--force', action='store_true', default=False,
-        help='overwrite existing plots')
+        help='plot and read all runs again, even if they are up to date')
     parser.add_argument(
-        '-r', '--resolution', type=int, default=1,
-        help='amount of plotted points per epoch')
+        '-r', '--resolution', type=int, default=None,
+        help='amount of plotted points per epoch; defaults to all rows')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='how many processes to create the plots of runs with')
+    parser.add_argument(
+        '-p', '--points', type=int, default=20000,
+        help='how many points of a scalar metric to plot at most')
+    parser.add_argument(
+        '--follow', action='store_true', default=False,
+        help='print the latest epoch of each metric while runs progress')
+    parser.add_argument(
+        '--interval', type=float, default=10,
+        help='seconds between updates when following runs')
     args = parser.parse_args(args)
     return args
 
@@ -34,9 +47,21 @@ def parse_args(args):
 def main(args):
     args = parse_args(args)
     args.directory = os.path.expanduser(args.directory)
-    plot_stats = Stats(args.type, args.metrics)
+    if args.follow:
+        follow = Follow(args.metrics, args.interval)
+        follow(list(find_experiments(args)))
+        return
+    plot_stats = Stats(
+        args.type, args.metrics, args.resolution, args.jobs, args.force,
+        args.points)
+    failures = []
     for experiment in find_experiments(args):
-        plot_stats(experiment)
+        failures += plot_stats(experiment)
+    if failures:
+        print('\nFailed to plot {} runs:'.format(len(failures)))
+        for title, _ in failures:
+            print(' ', title)
+        sys.exit(1)
 
 
 def find_experiments(args):
@@ -0,0 +1,77 @@
+import os
+import pickle
+
+
+class Cache:
+
+    """
+    Remember the metrics a reader returned for a stats database or folder.
+    The cache is stored next to the stats under the given name and is valid
+    while the modification times and sizes of the stats files and the key
+    describing the reader options stay the same.
+    """
+
+    def __init__(self, reader, name, key):
+        self._reader = reader
+        self._name = name
+        self._key = key
+
+    def __call__(self, filename, force=False):
+        """
+        Return the list of metrics read from the stats, reusing the cache if
+        it is fresh and not forced to read again.
+        """
+        entry = self._load(filename)
+        signature = self._signature(filename)
+        if not force and entry and entry['signature'] == signature:
+            return entry['metrics']
+        metrics = list(self._reader(filename))
+        self._store(filename, signature, metrics)
+        return metrics
+
+    def fresh(self, filename):
+        """
+        Whether the cache of the stats is up to date.
+        """
+        entry = self._load(filename)
+        return bool(entry) and entry['signature'] == self._signature(filename)
+
+    def filepath(self, filename):
+        directory = os.path.dirname(filename.rstrip('/'))
+        return os.path.join(directory, '{}.cache'.format(self._name))
+
+    def _signature(self, filename):
+        return signature(filename), self._key
+
+    def _load(self, filename):
+        filepath = self.filepath(filename)
+        if not os.path.isfile(filepath):
+            return None
+        try:
+            with open(filepath, 'rb') as file_:
+                return pickle.load(file_)
+        except (EOFError, pickle.UnpicklingError):
+            return None
+
+    def _store(self, filename, signature, metrics):
+        filepath = self.filepath(filename)
+        with open(filepath + '.tmp', 'wb') as file_:
+            pickle.dump(dict(signature=signature, metrics=metrics), file_)
+        os.replace(filepath + '.tmp', filepath)
+
+
+def signature(filename):
+    """
+    Names, modification times, and sizes of the files of a stats database or
+    folder, which change whenever metrics are written.
+    """
+    # Databases in write-ahead log mode append to a separate file.
+    if os.path.isdir(filename):
+        files = [os.path.join(filename, x) for x in os.listdir(filename)]
+    else:
+        files = [filename, filename + '-wal']
+    files = [x for x in sorted(files) if os.path.isfile(x)]
+    stats = [os.stat(x) for x in files]
+    return [
+        (os.path.basename(x), y.st_mtime_ns, y.st_size)
+        for x, y in zip(files, stats)]
@@ -0,0 +1,91 @@
+import os
+import sys
+import argparse
+import numpy as np
+import sqlalchemy as sql
+from mindpark.core.storage import SqliteStorage, ColumnStorage
+from mindpark.stats.reader import Reader
+
+
+def convert(directory, backend, lean=False):
+    """
+    Convert the metrics of a run directory between its stats database and
+    its folder of metric columns. The backend names the target format,
+    either 'sqlite' or 'columns'. The source is left untouched.
+    """
+    database = os.path.join(directory, 'stats.db')
+    folder = os.path.join(directory, ColumnStorage.FOLDER)
+    if backend == 'columns':
+        source, names = database, _database_columns(database)
+        target = ColumnStorage(directory)
+    elif backend == 'sqlite':
+        source, names = folder, _folder_columns(folder)
+        target = SqliteStorage(directory, lean)
+    else:
+        raise KeyError("unknown backend '{}'".format(backend))
+    for name, metric in Reader()(source):
+        columns, vector = names[name]
+        vector = vector and metric.data.shape[1]
+        handle = target.create(name, columns, vector)
+        timestamps = np.array([_seconds(x) for x in metric.timestamp.tolist()])
+        meta = np.stack([
+            metric.step, metric.epoch, metric.training, metric.episode], 1)
+        meta = meta.astype(np.int64)
+        data = np.asarray(metric.data)
+        target.write([(handle, timestamps, meta, data)])
+        print('Converted', name)
+    target.release()
+
+
+def _database_columns(filename):
+    if not os.path.isfile(filename):
+        raise FileNotFoundError('no stats database ' + filename)
+    engine = sql.create_engine('sqlite:///{}'.format(filename))
+    metadata = sql.MetaData()
+    metadata.reflect(engine)
+    names = {}
+    for name, table in metadata.tables.items():
+        columns = table.columns.values()[6:]
+        vector = isinstance(columns[0].type, sql.LargeBinary)
+        names[name] = [x.name for x in columns], vector
+    return names
+
+
+def _folder_columns(directory):
+    manifest = ColumnStorage.read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError('no metrics manifest in ' + directory)
+    return {
+        name: (entry['columns'], entry.get('vector'))
+        for name, entry in manifest.items()}
+
+
+def _seconds(timestamp):
+    if hasattr(timestamp, 'timestamp'):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        'python3 -m mindpark.stats.convert',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        'directory',
+        help='run directory containing the metrics to convert')
+    parser.add_argument(
+        '-t', '--to', choices=['sqlite', 'columns'], required=True,
+        help='storage format to convert the metrics into')
+    parser.add_argument(
+        '--lean', action='store_true', default=False,
+        help='use the lean layout when converting into a database')
+    return parser.parse_args(args)
+
+
+def main(args):
+    args = parse_args(args)
+    convert(os.path.expanduser(args.directory), args.to, args.lean)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import time
+import numpy as np
+from mindpark.core.storage import ColumnStorage
+from mindpark.stats.stats import find_runs
+from mindpark.utility import print_headline
+
+
+class Summary:
+
+    """
+    Rolling aggregate of the values of a metric in the latest epoch of the
+    training and evaluation phases. Rows of older epochs are ignored.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, epochs, training, values):
+        """
+        Add rows given their epochs, training flags, and a two dimensional
+        array of values.
+        """
+        values = values.reshape((len(values), -1)).astype(np.float64)
+        for phase in (True, False):
+            mask = training == phase
+            if not mask.any():
+                continue
+            epoch = epochs[mask].max()
+            current = self.phases.get(phase)
+            if current and current[0] > epoch:
+                continue
+            if not current or current[0] < epoch:
+                current = [epoch, 0, 0.0, np.inf, -np.inf]
+            rows = values[mask & (epochs == epoch)]
+            current[1] += len(rows)
+            current[2] += rows.mean(1).sum()
+            current[3] = min(current[3], rows.min())
+            current[4] = max(current[4], rows.max())
+            self.phases[phase] = current
+
+
+class Follow:
+
+    """
+    Poll the stats of running experiments and print a summary of the latest
+    epoch of each metric at a fixed interval. Only rows added since the
+    previous poll are read, using the row ids of databases and the row counts
+    of metric folders. Databases are opened read only, so that reading does
+    not block the writers.
+    """
+
+    def __init__(self, selectors=None, interval=10, chunk=65536):
+        self._selectors = selectors
+        self._interval = interval
+        self._chunk = chunk
+        self._positions = {}
+        self._summaries = {}
+
+    def __call__(self, experiments, iterations=None):
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            if iteration:
+                time.sleep(self._interval)
+            self.poll(experiments)
+            self.print_summaries()
+            iteration += 1
+
+    def poll(self, experiments):
+        """
+        Read the rows added to the stats of all runs since the last poll.
+        """
+        for experiment in experiments:
+            for algos in find_runs(experiment).values():
+                for runs in algos.values():
+                    for run in runs:
+                        self._poll_run(run)
+
+    def summaries(self):
+        """
+        Mapping from the run and the metric name to the summary.
+        """
+        return dict(self._summaries)
+
+    def print_summaries(self):
+        print_headline('Status at', time.strftime('%H:%M:%S'))
+        line = '{:<32} {:<24} {:<10} {:>5} {:>7} {:>10} {:>10} {:>10}'
+        print(line.format(
+            'Run', 'Metric', 'Phase', 'Epoch', 'Rows', 'Mean', 'Min', 'Max'))
+        for (run, name), summary in sorted(self._summaries.items()):
+            title = '{} on {} ({})'.format(run.algorithm, run.env, run.repeat)
+            for phase, values in sorted(summary.phases.items()):
+                epoch, count, total, min_, max_ = values
+                phase = 'Training' if phase else 'Evaluation'
+                print(line.format(
+                    title[:32], name[:24], phase, epoch, count,
+                    '{:.4g}'.format(total / count), '{:.4g}'.format(min_),
+                    '{:.4g}'.format(max_)))
+
+    def _poll_run(self, run):
+        if os.path.isdir(run.stats):
+            self._poll_folder(run)
+        elif os.path.isfile(run.stats):
+            self._poll_database(run)
+
+    def _poll_database(self, run):
+        uri = 'file:{}?mode=ro'.format(run.stats)
+        connection = sqlite3.connect(uri, uri=True)
+        try:
+            cursor = connection.cursor()
+            names = cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")
+            for name in self._select([x[0] for x in names.fetchall()]):
+                self._poll_table(cursor, run, name)
+        finally:
+            connection.close()
+
+    def _poll_table(self, cursor, run, name):
+        columns = cursor.execute('PRAGMA table_info("{}")'.format(name))
+        columns = columns.fetchall()[6:]
+        vector = columns[0][2].upper() == 'BLOB'
+        query = 'SELECT rowid, epoch, training, {} FROM "{}" WHERE rowid > ?'
+        query += ' ORDER BY rowid'
+        query = query.format(
+            ', '.join('"{}"'.format(x[1]) for x in columns), name)
+        cursor.execute(query, (self._positions.get((run, name), 0),))
+        while True:
+            rows = cursor.fetchmany(self._chunk)
+            if not rows:
+                break
+            fields = list(zip(*rows))
+            if vector:
+                values = [np.frombuffer(x, np.float32) for x in fields[3]]
+                values = np.array(values)
+            else:
+                values = np.array(fields[3:], np.float64).T
+            self._add(
+                run, name, np.array(fields[1], np.int64),
+                np.array(fields[2], bool), values)
+            self._positions[(run, name)] = fields[0][-1]
+
+    def _poll_folder(self, run):
+        manifest = ColumnStorage.read_manifest(run.stats)
+        if not manifest:
+            return
+        for name in self._select(manifest.keys()):
+            prefix = manifest[name]['prefix']
+            load = lambda x: np.load(
+                ColumnStorage.filepath(run.stats, prefix, x), mmap_mode='r')
+            columns = [load('epoch'), load('training')]
+            columns += [load(x) for x in manifest[name]['columns']]
+            # Columns can differ in length while rows are being appended.
+            end = min(len(x) for x in columns)
+            start = self._positions.get((run, name), 0)
+            if end <= start:
+                continue
+            values = [
+                x[start: end].reshape((end - start, -1)) for x in columns[2:]]
+            values = np.concatenate(values, 1)
+            self._add(
+                run, name, columns[0][start: end], columns[1][start: end],
+                values)
+            self._positions[(run, name)] = end
+
+    def _add(self, run, name, epochs, training, values):
+        if (run, name) not in self._summaries:
+            self._summaries[(run, name)] = Summary()
+        self._summaries[(run, name)].add(epochs, training, values)
+
+    def _select(self, metrics):
+        if not self._selectors:
+            return sorted(metrics)
+        selectors = self._selectors
+        return sorted(x for x in metrics if any(y in x for y in selectors))
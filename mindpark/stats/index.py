@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import argparse
+import numpy as np
+import sqlalchemy as sql
+from mindpark.stats.cache import signature
+from mindpark.stats.reader import Reader
+from mindpark.stats.stats import find_runs
+from mindpark.utility import aggregate, get_subdirs
+
+
+class Index:
+
+    """
+    Summary database of the scores of all runs in multiple experiments. For
+    every run, it stores the number of episodes, the last step, and the mean,
+    minimum, maximum, and percentiles of the scores per epoch and phase.
+    Updating only reads runs whose stats changed, starting from the last
+    epoch that was indexed for them.
+    """
+
+    PERCENTILES = (10, 50, 90)
+
+    def __init__(self, filename):
+        self.engine = sql.create_engine('sqlite:///{}'.format(filename))
+        metadata = sql.MetaData()
+        self._runs = sql.Table(
+            'runs', metadata,
+            sql.Column('id', sql.Integer, primary_key=True),
+            sql.Column('stats', sql.String, unique=True),
+            sql.Column('experiment', sql.String),
+            sql.Column('env', sql.String),
+            sql.Column('algorithm', sql.String),
+            sql.Column('repeat', sql.Integer),
+            sql.Column('signature', sql.String))
+        columns = ['mean', 'min', 'max']
+        columns += ['p{}'.format(x) for x in self.PERCENTILES]
+        self._epochs = sql.Table(
+            'epochs', metadata,
+            sql.Column('run', sql.Integer, primary_key=True),
+            sql.Column('epoch', sql.Integer, primary_key=True),
+            sql.Column('training', sql.Boolean, primary_key=True),
+            sql.Column('episodes', sql.Integer),
+            sql.Column('step', sql.Integer),
+            *[sql.Column(x, sql.Float) for x in columns])
+        metadata.create_all(self.engine)
+
+    def update(self, experiments):
+        """
+        Index the runs of the experiment directories and return the number of
+        runs that changed.
+        """
+        changed = 0
+        for experiment in experiments:
+            for algos in find_runs(experiment).values():
+                for runs in algos.values():
+                    changed += sum(self._update_run(x) for x in runs)
+        return changed
+
+    def leaderboard(self, training=False):
+        """
+        Rows of environment, algorithm, number of runs, and the mean score in
+        the latest epoch of each run, averaged over the runs. Sorted by
+        environment and descending score.
+        """
+        query = (
+            'SELECT r.env, r.algorithm, COUNT(*), AVG(e.mean) '
+            'FROM runs AS r JOIN epochs AS e ON e.run = r.id '
+            'WHERE e.training = :training AND e.epoch = ('
+            'SELECT MAX(epoch) FROM epochs '
+            'WHERE run = r.id AND training = :training) '
+            'GROUP BY r.env, r.algorithm '
+            'ORDER BY r.env, AVG(e.mean) DESC')
+        result = self.engine.execute(
+            sql.text(query), training=int(bool(training)))
+        return [tuple(x) for x in result]
+
+    def _update_run(self, run):
+        if not os.path.exists(run.stats):
+            return False
+        current = json.dumps(signature(run.stats))
+        select = sql.select([self._runs]).where(
+            self._runs.c.stats == run.stats)
+        entry = self.engine.execute(select).fetchone()
+        if entry and entry.signature == current:
+            return False
+        with self.engine.begin() as connection:
+            if entry:
+                id_ = entry.id
+            else:
+                id_ = connection.execute(self._runs.insert().values(
+                    stats=run.stats, experiment=run.experiment, env=run.env,
+                    algorithm=run.algorithm,
+                    repeat=run.repeat)).inserted_primary_key[0]
+            # The latest indexed epoch may have received more episodes.
+            start = connection.execute(sql.select(
+                [sql.func.max(self._epochs.c.epoch)]).where(
+                    self._epochs.c.run == id_)).scalar() or 0
+            rows = self._summarize(run.stats, start)
+            connection.execute(self._epochs.delete().where(sql.and_(
+                self._epochs.c.run == id_, self._epochs.c.epoch >= start)))
+            if rows:
+                for row in rows:
+                    row['run'] = id_
+                connection.execute(self._epochs.insert(), rows)
+            connection.execute(self._runs.update().where(
+                self._runs.c.id == id_).values(signature=current))
+        return True
+
+    def _summarize(self, stats, start):
+        reader = Reader(['score'], epochs=(start, None))
+        scores = [x for name, x in reader(stats) if name == 'score']
+        if not scores:
+            return []
+        score = scores[0]
+        # The reader sorts rows by epoch and phase, so groups are contiguous.
+        keys = score.epoch * 2 + score.training
+        borders = np.concatenate([
+            [0], np.flatnonzero(np.diff(keys)) + 1, [len(keys)]])
+        firsts = borders[:-1]
+        values = score.data[:, 0]
+        reduced = dict(
+            mean=aggregate(values, borders, 'mean'),
+            min=aggregate(values, borders, np.min),
+            max=aggregate(values, borders, np.max),
+            episodes=aggregate(values, borders, 'count'),
+            step=aggregate(score.step, borders, np.max))
+        percentiles = aggregate(values, borders, self.PERCENTILES)
+        for percentile, groups in zip(self.PERCENTILES, percentiles):
+            reduced['p{}'.format(percentile)] = groups
+        rows = []
+        for index, first in enumerate(firsts):
+            row = {k: v[index].item() for k, v in reduced.items()}
+            row['epoch'] = int(score.epoch[first])
+            row['training'] = bool(score.training[first])
+            row['episodes'] = int(row['episodes'])
+            row['step'] = int(row['step'])
+            rows.append(row)
+        return rows
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        'python3 -m mindpark.stats.index',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        'directories', nargs='*', default=['~/experiment/mindpark/'],
+        help='roots containing experiments to index')
+    parser.add_argument(
+        '-o', '--output', default='~/experiment/mindpark/index.db',
+        help='filename of the summary database')
+    parser.add_argument(
+        '-l', '--leaderboard', action='store_true', default=False,
+        help='print the evaluation scores of the latest epochs')
+    return parser.parse_args(args)
+
+
+def main(args):
+    args = parse_args(args)
+    index = Index(os.path.expanduser(args.output))
+    experiments = []
+    for directory in args.directories:
+        experiments += get_subdirs(os.path.expanduser(directory))
+    print('Updated', index.update(experiments), 'runs')
+    if args.leaderboard:
+        for env, algorithm, runs, score in index.leaderboard():
+            print('{:<24} {:<24} {:>4} runs {:>10.2f}'.format(
+                env, algorithm, runs, score))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
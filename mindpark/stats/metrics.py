@@ -12,8 +12,8 @@ class Metrics(Figure):
     automatically, based on the data.
     """
 
-    def __init__(self):
-        self._plot_scalar = Scalar()
+    def __init__(self, points=20000):
+        self._plot_scalar = Scalar(points)
         self._plot_counts = Histogram()
         self._plot_distribution = Histogram(normalize=True)
 
@@ -41,7 +41,7 @@ class Metrics(Figure):
     def _process_metric(self, ax, metric):
         if not metric.data.size:
             ax.tick_params(colors=(0, 0, 0, 0))
-            ax.set_axis_bgcolor(cm.get_cmap('viridis')(0))
+            ax.set_facecolor(cm.get_cmap('viridis')(0))
             divider = make_axes_locatable(ax)
             divider.append_axes('right', size='7%', pad=0.1).axis('off')
             return
@@ -51,9 +51,7 @@ class Metrics(Figure):
             self._plot_scalar(ax, domain, metric.data[:, 0])
         elif metric.data.shape[1] == 1:
             indices = metric.data[:, 0].astype(int)
-            min_, max_ = indices.min(), indices.max()
-            count = np.eye(max_ - min_ + 1)[indices - min_]
-            self._plot_distribution(ax, domain, count)
+            self._plot_distribution(ax, domain, indices - indices.min())
         elif metric.data.shape[1] > 1:
             self._plot_counts(ax, domain, metric.data)
 
@@ -1,6 +1,7 @@
 import os
 import numpy as np
 import sqlalchemy as sql
+from mindpark.core.storage import ColumnStorage
 from mindpark.utility import natural_sorted
 
 
@@ -25,14 +26,41 @@ class Metric(dict):
 class Reader:
 
     """
-    Read a stats database file and iterate over its metrics. Optionally,
-    metrics and their order can be selected by partial names.
+    Read a stats database file or a folder of metric columns and iterate over
+    its metrics. Optionally, metrics and their order can be selected by
+    partial names.
+
+    Rows can be filtered by the training flag and a range of epochs given as
+    start and stop, and values by a subset of column names. Metrics without
+    any of the columns are skipped. Databases are filtered and sorted in SQL
+    and rows are streamed in chunks into typed arrays.
+
+    With a resolution, the steps of each epoch and training phase are split
+    into that many bins and every bin is reduced to one row. The data then
+    holds the mean of each column, and the minimum, maximum, and count keys
+    hold the spread and number of rows of the bin. Databases reduce the bins
+    in SQL, except for vector metrics.
     """
 
-    def __init__(self, selectors=None):
+    KEYS = ('step', 'epoch', 'training', 'episode')
+    ORDER = ('epoch', 'training', 'episode', 'step')
+
+    def __init__(
+            self, selectors=None, training=None, epochs=None, columns=None,
+            resolution=None, chunk=65536):
+        if resolution is not None and resolution < 1:
+            raise ValueError('resolution must be at least one bin per epoch')
         self._selectors = selectors
+        self._training = training
+        self._epochs = epochs or (None, None)
+        self._columns = columns
+        self._resolution = resolution
+        self._chunk = chunk
 
     def __call__(self, filename):
+        if os.path.isdir(filename):
+            yield from self._read_folder(filename)
+            return
         assert os.path.isfile(filename)
         engine = sql.create_engine('sqlite:///{}'.format(filename))
         metadata = sql.MetaData()
@@ -43,6 +71,35 @@ class Reader:
                 continue
             yield name, columns
 
+    def _read_folder(self, directory):
+        manifest = ColumnStorage.read_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError('no metrics manifest in ' + directory)
+        for name in self._select_metrics(manifest.keys()):
+            prefix = manifest[name]['prefix']
+            load = lambda x: np.load(
+                ColumnStorage.filepath(directory, prefix, x), mmap_mode='r')
+            names = self._select_columns(manifest[name]['columns'])
+            if not names:
+                continue
+            keys = {x: load(x) for x, _ in ColumnStorage.KEYS}
+            values = [load(x) for x in names]
+            # Columns can differ in length after an interrupted write.
+            rows = min(len(x) for x in list(keys.values()) + values)
+            columns = Metric({k: v[:rows] for k, v in keys.items()})
+            columns['id'] = np.arange(rows)
+            if manifest[name].get('vector'):
+                columns['data'] = values[0][:rows]
+            else:
+                columns['data'] = np.stack([x[:rows] for x in values], 1)
+            columns = columns[self._filter_rows(columns)]
+            if not len(columns.id):
+                continue
+            columns = self._sort_columns(columns)
+            if self._resolution:
+                columns = self._reduce_bins(columns)
+            yield name, columns
+
     def _select_metrics(self, metrics):
         if not self._selectors:
             return natural_sorted(metrics)
@@ -57,22 +114,169 @@ class Reader:
             selected += matches
         return selected
 
+    def _select_columns(self, columns):
+        if self._columns is None:
+            return list(columns)
+        return [x for x in self._columns if x in columns]
+
+    def _filter_rows(self, columns):
+        mask = np.ones(len(columns.id), bool)
+        if self._training is not None:
+            mask &= columns.training == bool(self._training)
+        start, stop = self._epochs
+        if start is not None:
+            mask &= columns.epoch >= start
+        if stop is not None:
+            mask &= columns.epoch < stop
+        return mask
+
+    def _where(self, prefix=''):
+        conditions, params = [], []
+        if self._training is not None:
+            conditions.append(prefix + 'training = ?')
+            params.append(int(bool(self._training)))
+        start, stop = self._epochs
+        if start is not None:
+            conditions.append(prefix + 'epoch >= ?')
+            params.append(int(start))
+        if stop is not None:
+            conditions.append(prefix + 'epoch < ?')
+            params.append(int(stop))
+        if not conditions:
+            return '', params
+        return ' WHERE ' + ' AND '.join(conditions), params
+
     def _collect_columns(self, engine, table):
-        result = engine.execute(sql.select([table]))
-        columns = np.array([x for x in result]).T
-        if not len(columns) or not columns.shape[1]:
+        names = self._select_columns([x.name for x in list(table.columns)[6:]])
+        if not names:
             return None
-        columns = Metric(
-            id=np.array([int(x, 16) for x in columns[0]]),
-            timestamp=columns[1],
-            step=columns[2].astype(int),
-            epoch=columns[3].astype(int),
-            training=columns[4].astype(bool),
-            episode=columns[5].astype(int),
-            data=columns[6:].T.astype(float))
-        columns = self._sort_columns(columns)
+        vector = isinstance(table.columns[names[0]].type, sql.LargeBinary)
+        # The old layout stores random ids, so order ties by insertion.
+        lean = isinstance(table.c.id.type, sql.Integer)
+        if self._resolution and not vector:
+            query, params = self._bins_query(table.name, names)
+        else:
+            query, params = self._rows_query(table.name, names)
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            columns = self._stream(cursor, lean, vector)
+            cursor.close()
+        finally:
+            connection.close()
+        if columns is None:
+            return None
+        if self._resolution and vector:
+            columns = self._reduce_bins(columns)
+        elif self._resolution:
+            # The query returns means, minima, maxima, and the count.
+            data, width = columns.data, len(names)
+            columns.data = data[:, :width]
+            columns['minimum'] = data[:, width: 2 * width]
+            columns['maximum'] = data[:, 2 * width: 3 * width]
+            columns['count'] = data[:, -1].astype(np.int64)
         return columns
 
+    def _rows_query(self, name, names):
+        where, params = self._where()
+        query = 'SELECT rowid, timestamp, {}, {} FROM "{}"{} ORDER BY {}'
+        query = query.format(
+            ', '.join(self.KEYS), ', '.join('"{}"'.format(x) for x in names),
+            name, where, ', '.join(self.ORDER + ('rowid',)))
+        return query, params
+
+    def _bins_query(self, name, names):
+        # Join the step range of each epoch and training phase to compute the
+        # bin of every row, then reduce the rows of each bin.
+        inner, inner_params = self._where()
+        outer, outer_params = self._where('t.')
+        values = []
+        for reducer in ('AVG', 'MIN', 'MAX'):
+            values += ['{}(t."{}")'.format(reducer, x) for x in names]
+        bin_ = '(t.step - g.low) * {} / (g.high - g.low + 1)'.format(
+            int(self._resolution))
+        query = (
+            'SELECT MIN(t.rowid), MAX(t.timestamp), '
+            'CAST(AVG(t.step) AS INTEGER), t.epoch, t.training, '
+            'CAST(AVG(t.episode) AS INTEGER), {values}, COUNT(*) '
+            'FROM "{name}" AS t JOIN ('
+            'SELECT epoch, training, MIN(step) AS low, MAX(step) AS high '
+            'FROM "{name}"{inner} GROUP BY epoch, training) AS g '
+            'ON t.epoch = g.epoch AND t.training = g.training{outer} '
+            'GROUP BY t.epoch, t.training, {bin_} '
+            'ORDER BY t.epoch, t.training, MIN(t.step)')
+        query = query.format(
+            values=', '.join(values), name=name, inner=inner, outer=outer,
+            bin_=bin_)
+        return query, inner_params + outer_params
+
+    def _reduce_bins(self, columns):
+        # Same bins as the SQL query, for folders and vector metrics. Expects
+        # the rows to be sorted.
+        phase = columns.epoch * 2 + columns.training
+        _, phase = np.unique(phase, return_inverse=True)
+        low = np.full(phase.max() + 1, np.iinfo(np.int64).max)
+        high = np.full(phase.max() + 1, np.iinfo(np.int64).min)
+        np.minimum.at(low, phase, columns.step)
+        np.maximum.at(high, phase, columns.step)
+        low, high = low[phase], high[phase]
+        bins = (columns.step - low) * self._resolution // (high - low + 1)
+        _, first, bins, count = np.unique(
+            phase * self._resolution + bins, return_index=True,
+            return_inverse=True, return_counts=True)
+        data = np.asarray(columns.data, np.float64)
+        mean = np.stack([
+            np.bincount(bins, x, len(count)) for x in data.T], 1)
+        mean /= count[:, None]
+        minimum = np.full(mean.shape, np.inf)
+        maximum = np.full(mean.shape, -np.inf)
+        np.minimum.at(minimum, bins, data)
+        np.maximum.at(maximum, bins, data)
+        average = lambda x: (np.bincount(bins, x) // count).astype(np.int64)
+        ids = columns.id[first].copy()
+        np.minimum.at(ids, bins, columns.id)
+        timestamp = columns.timestamp[first].copy()
+        np.maximum.at(timestamp, bins, columns.timestamp)
+        return Metric(
+            id=ids,
+            timestamp=timestamp,
+            step=average(columns.step),
+            epoch=columns.epoch[first],
+            training=columns.training[first],
+            episode=average(columns.episode),
+            data=mean,
+            minimum=minimum,
+            maximum=maximum,
+            count=count)
+
+    def _stream(self, cursor, lean, vector):
+        # Convert the rows chunk by chunk, so that only one chunk of rows is
+        # held as Python objects at a time, and concatenate the arrays at the
+        # end. This avoids running the query a second time to count the rows.
+        keys = ('id', 'timestamp') + self.KEYS
+        dtypes = (
+            np.int64, np.float64 if lean else 'datetime64[us]', np.int64,
+            np.int64, bool, np.int64)
+        chunks = {key: [] for key in keys + ('data',)}
+        while True:
+            chunk = cursor.fetchmany(self._chunk)
+            if not chunk:
+                break
+            fields = list(zip(*chunk))
+            for key, dtype, field in zip(keys, dtypes, fields):
+                chunks[key].append(np.array(field, dtype))
+            if vector:
+                data = np.frombuffer(b''.join(fields[-1]), np.float32)
+                data = data.reshape((len(chunk), -1))
+            else:
+                data = np.array(fields[len(keys):], np.float64).T
+            chunks['data'].append(data)
+        if not chunks['data']:
+            return None
+        return Metric({
+            key: np.concatenate(value) for key, value in chunks.items()})
+
     def _sort_columns(self, columns):
         c = columns
         order = np.lexsort([c.id, c.step, c.episode, c.training, c.epoch])
@@ -1,6 +1,12 @@
 import re
 import os
 import collections
+import functools
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib.pyplot as plt
+from mindpark.core.storage import ColumnStorage
+from mindpark.stats.cache import Cache
 from mindpark.stats.reader import Reader
 from mindpark.stats.metrics import Metrics
 from mindpark.stats.scores import Scores
@@ -16,59 +22,138 @@ class Stats:
     """
     Core functionality of the stats sub command. Read metrics from an
     experiment using a Reader and plot the using Scores and Metrics figures.
+    The metrics plots of multiple runs can be created by a pool of processes.
+    Failed runs are reported and do not stop the remaining plots.
+
+    The metrics read from each run are cached next to its stats. Plots are
+    skipped if they exist and the stats they show did not change, unless
+    forced.
     """
 
-    def __init__(self, type_, selectors=None):
+    def __init__(
+            self, type_, selectors=None, resolution=None, jobs=1,
+            force=False, points=20000):
         self._type = type_
-        self._read_scores = lambda x: next(Reader(['score'])(x))[1]
+        self._jobs = jobs
+        self._force = force
+        self._read_scores = Cache(
+            Reader(['score'], resolution=resolution), 'scores',
+            (['score'], resolution))
         self._plot_scores = Scores()
-        self._read_metrics = Reader(selectors)
-        self._plot_metrics = Metrics()
+        self._read_metrics = Cache(
+            Reader(selectors, resolution=resolution), 'metrics',
+            (selectors, resolution))
+        self._plot_metrics = Metrics(points)
 
     def __call__(self, experiment):
+        """
+        Create the plots of the experiment and return a list of failed runs,
+        each as a tuple of the plot title and the error message.
+        """
         runs = self._collect_runs(experiment)
+        if self._jobs > 1:
+            with ProcessPoolExecutor(self._jobs, initializer=_use_agg) as pool:
+                plots = [
+                    (x, pool.submit(self._create_metrics_plot, x).result)
+                    for x in self._flatten_runs(runs)]
+                failures = self._collect_failures(plots)
+        else:
+            plots = [
+                (x, functools.partial(self._create_metrics_plot, x))
+                for x in self._flatten_runs(runs)]
+            failures = self._collect_failures(plots)
         self._create_scores_plot(runs)
+        return failures
+
+    def _flatten_runs(self, runs):
         runs = [list(x.values()) for x in runs.values()]
-        runs = sum(sum(runs, []), [])
-        for run in runs:
-            self._create_metrics_plot(run)
+        return sum(sum(runs, []), [])
+
+    def _collect_failures(self, plots):
+        failures = []
+        for run, plot in plots:
+            try:
+                plot()
+            except Exception as e:
+                failures.append((self._title(run), _format_error(e)))
+                print(failures[-1][1])
+        return failures
+
+    def _title(self, run):
+        return '{} on {} (Repeat {})'.format(
+            run.algorithm, run.env, run.repeat)
 
     def _create_scores_plot(self, envs):
+        runs = self._flatten_runs(envs)
+        name = os.path.basename(runs[0].experiment)
+        filepath = os.path.join(
+            runs[0].experiment, '{}.{}'.format(name, self._type))
+        fresh = all(self._read_scores.fresh(x.stats) for x in runs)
+        if self._skip(filepath, fresh):
+            print(' Skip scores that are up to date.')
+            return
         scores = {}
         for env, algos in envs.items():
             scores[env] = collections.defaultdict(list)
             for algo, runs in algos.items():
-                scores[env][algo] = [self._read_scores(x.stats) for x in runs]
-        name = os.path.basename(runs[0].experiment)
+                scores[env][algo] = [
+                    self._read_scores(x.stats, self._force)[0][1]
+                    for x in runs]
         title = re.findall(r'[A-Za-z]{2,}', name)
         title = ' '.join(x.title() for x in title)
-        filepath = os.path.join(runs[0].experiment, name)
         self._plot_scores(scores, title, filepath)
 
     def _create_metrics_plot(self, run):
-        title = '{} on {} (Repeat {})'.format(
-            run.algorithm, run.env, run.repeat)
+        title = self._title(run)
+        filepath = '{}-{}-{}-{}.{}'.format(
+            run.name, run.env, run.algorithm, run.repeat, self._type)
+        filepath = os.path.join(run.experiment, filepath)
+        if self._skip(filepath, self._read_metrics.fresh(run.stats)):
+            print(' Skip run', title, 'that is up to date.')
+            return
         print(' Plot run', title)
-        metrics = list(self._read_metrics(run.stats))
+        metrics = self._read_metrics(run.stats, self._force)
         if not metrics:
             print('  No metrics found.')
             return
-        filepath = '{}-{}-{}-{}.{}'.format(
-            run.name, run.env, run.algorithm, run.repeat, self._type)
-        filepath = os.path.join(run.experiment, filepath)
         self._plot_metrics(metrics, title, filepath)
 
+    def _skip(self, filepath, fresh):
+        return not self._force and fresh and os.path.exists(filepath)
+
     def _collect_runs(self, experiment):
         print('Read experiment', experiment)
-        name = os.path.basename(experiment).title()
-        runs = {}
-        for env_dir in get_subdirs(experiment):
-            env = os.path.basename(env_dir)
-            runs[env] = collections.defaultdict(list)
-            for directory in natural_sorted(get_subdirs(env_dir)):
-                repeat = int(directory.rsplit('-', 1)[-1])
-                algorithm = read_yaml(directory, 'algorithm.yaml').name
-                stats = os.path.join(directory, 'stats.db')
-                run = Run(experiment, name, env, algorithm, repeat, stats)
-                runs[env][algorithm].append(run)
-        return runs
+        return find_runs(experiment)
+
+
+def find_runs(experiment):
+    """
+    Nested mapping from environment and algorithm names to the list of runs
+    in the experiment. Runs that did not start yet are skipped.
+    """
+    name = os.path.basename(experiment).title()
+    runs = {}
+    for env_dir in get_subdirs(experiment):
+        env = os.path.basename(env_dir)
+        runs[env] = collections.defaultdict(list)
+        for directory in natural_sorted(get_subdirs(env_dir)):
+            if not os.path.isfile(os.path.join(directory, 'algorithm.yaml')):
+                continue
+            repeat = int(directory.rsplit('-', 1)[-1])
+            algorithm = read_yaml(directory, 'algorithm.yaml').name
+            stats = os.path.join(directory, 'stats.db')
+            if not os.path.exists(stats):
+                stats = os.path.join(directory, ColumnStorage.FOLDER)
+            run = Run(experiment, name, env, algorithm, repeat, stats)
+            runs[env][algorithm].append(run)
+    return runs
+
+
+def _use_agg():
+    plt.switch_backend('Agg')
+
+
+def _format_error(error):
+    # Errors from worker processes carry the remote traceback as their cause.
+    lines = traceback.format_exception(type(error), error, error.__traceback__)
+    return ''.join(lines).strip()
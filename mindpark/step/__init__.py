@@ -12,6 +12,7 @@ from .maximum import Maximum
 from .normalize import Normalize
 from .random import Random
 from .random_start import RandomStart
+from .resize import Resize
 from .skip import Skip
 from .subsample import Subsample
 from .score import Score
@@ -1,6 +1,7 @@
 import numpy as np
 from gym.spaces import Box
 from mindpark.core import Partial, Metric
+from mindpark.core.aggregate import Reduce, Histogram
 
 
 class ActionMax(Partial):
@@ -8,8 +9,11 @@ class ActionMax(Partial):
     def __init__(self, task):
         super().__init__(task)
         choices = self.task.actions.n
-        self._values = Metric(self.task, 'action_max/values', choices)
-        self._action = Metric(self.task, 'action_max/action', 1)
+        self._values = Metric(
+            self.task, 'action_max/values', choices,
+            aggregate=Reduce(), vector=True)
+        self._action = Metric(
+            self.task, 'action_max/action', 1, aggregate=Histogram(choices))
 
     @property
     def above_observs(self):
@@ -23,7 +27,7 @@ class ActionMax(Partial):
         super().observe(observ)
         values = self.above.observe(observ)
         action = values.argmax()
-        self._values(*values)
+        self._values(values)
         self._action(action)
         return action
 
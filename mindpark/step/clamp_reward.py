@@ -1,3 +1,4 @@
+import numpy as np
 from mindpark.core import Partial
 
 
@@ -11,6 +12,10 @@ class ClampReward(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        return self.above.ignores
+
     def observe(self, observ):
         super().observe(observ)
         return self.above.observe(observ)
@@ -19,3 +24,10 @@ class ClampReward(Partial):
         super().receive(reward, final)
         reward = max(0, min(reward, 1))
         self.above.receive(reward, final)
+
+    def observe_batch(self, indices, observs):
+        return self.above.observe_batch(indices, observs)
+
+    def receive_batch(self, indices, rewards, finals):
+        rewards = np.clip(rewards, 0, 1)
+        self.above.receive_batch(indices, rewards, finals)
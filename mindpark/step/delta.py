@@ -1,14 +1,27 @@
 import numpy as np
 from gym.spaces import Box
 from mindpark.core import Partial
+from mindpark.utility import grow_rows, push_rows
 
 
 class Delta(Partial):
 
+    """
+    Forward the difference to the last observation. The first observation of
+    an episode results in zeros. Differences are computed in the floating
+    point type of the task. The last observation is stored in one of two
+    alternating buffers, so that no reference to the caller's array is kept.
+    Observations of multiple environments can be stacked along the first
+    axis, then every environment has its own pair of buffers.
+    """
+
     def __init__(self, task):
         super().__init__(task)
-        self._last = None
-        self._empty = np.zeros(self.task.observs.shape)
+        self._buffers = None
+        self._index = 0
+        self._first = None
+        self._batch_buffer = None
+        self._batch_offset = np.zeros(0, int)
 
     @property
     def above_observs(self):
@@ -22,17 +35,49 @@ class Delta(Partial):
 
     def begin_episode(self, episode, training):
         super().begin_episode(episode, training)
-        self._last = None
+        self._first = True
 
     def observe(self, observ):
         super().observe(observ)
-        if self._last is None:
-            delta = self._empty
-        else:
-            delta = observ - self._last
-        self._last = observ
+        delta = self._difference(observ, self._first)
+        self._first = False
         return self.above.observe(delta)
 
     def receive(self, reward, final):
         super().receive(reward, final)
         self.above.receive(reward, final)
+
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._batch_offset = grow_rows(self._batch_offset, index)
+        self._batch_offset[index] = 0
+
+    def observe_batch(self, indices, observs):
+        # The first observation of an episode fills both buffers of its
+        # environment, so that its difference is zero.
+        self._batch_buffer = push_rows(
+            self._batch_buffer, self._batch_offset, indices, observs, 2,
+            self.task.dtype)
+        offset = self._batch_offset[indices]
+        current = self._batch_buffer[indices, (offset - 1) % 2]
+        last = self._batch_buffer[indices, offset % 2]
+        delta = np.subtract(current, last, out=current)
+        return self.above.observe_batch(indices, delta)
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
+
+    def _difference(self, observ, first):
+        """
+        Store the observation and return its difference to the previous one.
+        """
+        if self._buffers is None or self._buffers.shape[1:] != observ.shape:
+            self._buffers = np.zeros((2,) + observ.shape, self.task.dtype)
+        self._index = 1 - self._index
+        current = self._buffers[self._index]
+        last = self._buffers[1 - self._index]
+        np.copyto(current, observ, casting='unsafe')
+        delta = np.subtract(current, last)
+        if first:
+            delta.fill(0)
+        return delta
@@ -1,7 +1,8 @@
 import numpy as np
 from gym.spaces import Box
 from mindpark.core import Partial, Metric
-from mindpark.utility import Decay
+from mindpark.core.aggregate import Reduce, Histogram
+from mindpark.utility import Decay, grow_rows
 
 
 class EpsilonGreedy(Partial):
@@ -19,13 +20,16 @@ class EpsilonGreedy(Partial):
         self._test = test
         self._epsilon = Decay(from_, to, over)
         self._metric_epsilon = Metric(
-            self.task, 'epsilon_greedy/epsilon', 1)
+            self.task, 'epsilon_greedy/epsilon', 1, aggregate=Reduce())
         self._metric_values = Metric(
-            self.task, 'epsilon_greedy/values', self.task.actions.n)
+            self.task, 'epsilon_greedy/values', self.task.actions.n,
+            aggregate=Reduce(), vector=True)
         self._metric_action = Metric(
-            self.task, 'epsilon_greedy/action', 1)
+            self.task, 'epsilon_greedy/action', 1,
+            aggregate=Histogram(self.task.actions.n))
         self._metric_random = Metric(
-            self.task, 'epsilon_greedy/random', 1)
+            self.task, 'epsilon_greedy/random', 1, aggregate=Reduce())
+        self._batch_training = np.zeros(0, bool)
 
     @property
     def above_observs(self):
@@ -47,7 +51,7 @@ class EpsilonGreedy(Partial):
             random = False
             action = np.argmax(values)
         self._metric_epsilon(epsilon)
-        self._metric_values(*values)
+        self._metric_values(values)
         self._metric_action(action)
         self._metric_random(random)
         return action
@@ -55,3 +59,26 @@ class EpsilonGreedy(Partial):
     def receive(self, reward, final):
         super().receive(reward, final)
         self.above.receive(reward, final)
+
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._batch_training = grow_rows(self._batch_training, index)
+        self._batch_training[index] = training
+
+    def observe_batch(self, indices, observs):
+        step = max(0, self.task.step - self._offset)
+        epsilon = np.where(
+            self._batch_training[indices], self._epsilon(step), self._test)
+        values = self.above.observe_batch(indices, observs)
+        random = self.random.rand(len(indices)) <= epsilon
+        actions = np.argmax(values, 1)
+        actions[random] = self.random.randint(
+            0, self.task.actions.n, random.sum())
+        self._metric_epsilon.extend(epsilon)
+        self._metric_values.extend(values)
+        self._metric_action.extend(actions)
+        self._metric_random.extend(random)
+        return actions
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+import numpy as np
 from gym.spaces import Box
 from mindpark.core import Partial
 
@@ -24,8 +25,14 @@ class Filter(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        return self.above.ignores
+
     def observe(self, observ):
         super().observe(observ)
+        if observ is None or self.above.ignores:
+            return self.above.observe(None)
         observ = self.filter(observ)
         assert self.above_task.observs.contains(observ)
         return self.above.observe(observ)
@@ -34,6 +41,19 @@ class Filter(Partial):
         super().receive(reward, final)
         self.above.receive(reward, final)
 
+    def observe_batch(self, indices, observs):
+        return self.above.observe_batch(indices, self.filter_batch(observs))
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
+
     @abstractmethod
     def filter(self, observ):
         pass
+
+    def filter_batch(self, observs):
+        """
+        Filter observations stacked along the first axis. Override this with
+        a vectorized version when possible.
+        """
+        return np.array([self.filter(x) for x in observs])
@@ -6,7 +6,8 @@ class Grayscale(Filter):
 
     """
     Convert observations to grayscale, dropping their last dimension. The
-    default weighting of the RGB channels extracts the luminance.
+    default weighting of the RGB channels extracts the luminance. Observations
+    of type uint8 are converted in fixed point arithmetic and stay uint8.
     """
 
     def __init__(self, task, weighting=(0.299, 0.587, 0.114)):
@@ -14,6 +15,51 @@ class Grayscale(Filter):
         if len(weighting) != self.task.observs.shape[-1]:
             raise ValueError('weighting must match last axis of observations')
         self._weighting = np.array(weighting) / sum(weighting)
+        self._fixed = self._fixed_point(self._weighting)
+        shape = self.task.observs.shape[:-1]
+        self._buffer = np.empty(shape, np.uint16)
+        self._channel = np.empty(shape, np.uint16)
+        self._batch_buffer = np.empty((0,) + shape, np.uint16)
+        self._batch_channel = np.empty((0,) + shape, np.uint16)
 
     def filter(self, observ):
-        return (self._weighting * observ).sum(-1)
+        if observ.dtype != np.uint8:
+            return (self._weighting * observ).sum(-1)
+        if self._buffer.shape != observ.shape[:-1]:
+            self._buffer = np.empty(observ.shape[:-1], np.uint16)
+            self._channel = np.empty(observ.shape[:-1], np.uint16)
+        return self._filter_uint8(observ, self._buffer, self._channel)
+
+    def filter_batch(self, observs):
+        if observs.dtype != np.uint8:
+            return (self._weighting * observs).sum(-1)
+        # Separate scratch space that only grows, so that batches of varying
+        # sizes neither reallocate it nor the buffers of single observations.
+        if len(self._batch_buffer) < len(observs):
+            self._batch_buffer = np.empty(observs.shape[:-1], np.uint16)
+            self._batch_channel = np.empty(observs.shape[:-1], np.uint16)
+        count = len(observs)
+        return self._filter_uint8(
+            observs, self._batch_buffer[:count], self._batch_channel[:count])
+
+    def _filter_uint8(self, observ, buffer, channel):
+        np.multiply(
+            observ[..., 0], self._fixed[0], out=buffer, dtype=np.uint16)
+        for index in range(1, len(self._fixed)):
+            np.multiply(
+                observ[..., index], self._fixed[index], out=channel,
+                dtype=np.uint16)
+            buffer += channel
+        # Round to nearest when dropping the fractional bits.
+        buffer += 128
+        gray = np.empty(buffer.shape, np.uint8)
+        np.right_shift(buffer, 8, out=gray, casting='unsafe')
+        return gray
+
+    @staticmethod
+    def _fixed_point(weighting):
+        # Weights summing to 256 keep the weighted sum of uint8 channels in 16
+        # bits and map white to 255.
+        fixed = np.round(weighting * 256).astype(np.uint16)
+        fixed[fixed.argmax()] += 256 - int(fixed.sum())
+        return fixed
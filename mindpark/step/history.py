@@ -1,6 +1,7 @@
 import numpy as np
 from gym.spaces import Box
 from mindpark.core import Partial
+from mindpark.utility import grow_rows, push_rows
 
 
 class History(Partial):
@@ -8,8 +9,10 @@ class History(Partial):
     def __init__(self, interface, amount=4):
         super().__init__(interface)
         self._amount = amount
-        self._buffer = np.empty((self._amount,) + self.task.observs.shape)
+        self._buffer = None
         self._offset = None
+        self._batch_buffer = None
+        self._batch_offset = np.zeros(0, int)
 
     @property
     def above_observs(self):
@@ -35,7 +38,24 @@ class History(Partial):
         super().receive(reward, final)
         self.above.receive(reward, final)
 
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._batch_offset = grow_rows(self._batch_offset, index)
+        self._batch_offset[index] = 0
+
+    def observe_batch(self, indices, observs):
+        self._batch_buffer = push_rows(
+            self._batch_buffer, self._batch_offset, indices, observs,
+            self._amount)
+        return self.above.observe_batch(indices, self._history_batch(indices))
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
+
     def _push(self, observ):
+        if self._buffer is None or self._buffer.dtype != observ.dtype:
+            shape = (self._amount,) + observ.shape
+            self._buffer = np.empty(shape, observ.dtype)
         self._buffer[self._offset % self._amount] = observ
         self._offset += 1
 
@@ -44,5 +64,11 @@ class History(Partial):
         order = [max(0, last + x) % self._amount for x in range(self._amount)]
         return np.moveaxis(self._buffer[order], 0, -1)
 
+    def _history_batch(self, indices):
+        last = self._batch_offset[indices, np.newaxis] - self._amount
+        order = (last + np.arange(self._amount)) % self._amount
+        history = self._batch_buffer[indices[:, np.newaxis], order]
+        return np.moveaxis(history, 1, -1)
+
     def _repeat(self, array):
         return np.ones(array.shape + (self._amount,)) * array[..., np.newaxis]
@@ -17,6 +17,10 @@ class Identity(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        return self.above.ignores
+
     def observe(self, observ):
         super().observe(observ)
         action = self.above.observe(observ)
@@ -26,3 +30,9 @@ class Identity(Partial):
     def receive(self, reward, final):
         super().receive(reward, final)
         self.above.receive(reward, final)
+
+    def observe_batch(self, indices, observs):
+        return self.above.observe_batch(indices, observs)
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
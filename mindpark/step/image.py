@@ -24,8 +24,14 @@ class Image(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        return self.above.ignores
+
     def observe(self, observ):
         super().observe(observ)
+        if observ is None or self.above.ignores:
+            return self.above.observe(None)
         observ = self._expand_dims(observ)
         assert self.above_task.observs.contains(observ)
         return self.above.observe(observ)
@@ -34,10 +40,18 @@ class Image(Partial):
         super().receive(reward, final)
         self.above.receive(reward, final)
 
-    def _expand_dims(self, observ):
+    def observe_batch(self, indices, observs):
+        observs = self._expand_dims(observs, batch=True)
+        return self.above.observe_batch(indices, observs)
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
+
+    def _expand_dims(self, observ, batch=False):
         observ = np.array(observ)
-        if len(observ.shape) > 3:
+        dims = 4 if batch else 3
+        if len(observ.shape) > dims:
             raise ValueError('observations already have too many dimensions')
-        for _ in range(3 - len(observ.shape)):
+        for _ in range(dims - len(observ.shape)):
             observ = np.expand_dims(observ, -1)
         return observ
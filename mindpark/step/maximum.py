@@ -1,5 +1,6 @@
 import numpy as np
 from mindpark.core import Partial
+from mindpark.utility import grow_rows, push_rows
 
 
 class Maximum(Partial):
@@ -11,8 +12,10 @@ class Maximum(Partial):
     def __init__(self, task, amount=2):
         super().__init__(task)
         self._amount = amount
-        self._buffer = np.empty((self._amount,) + self.task.observs.shape)
+        self._buffer = None
         self._offset = None
+        self._batch_buffer = None
+        self._batch_offset = np.zeros(0, int)
 
     @property
     def above_observs(self):
@@ -22,13 +25,22 @@ class Maximum(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        # We need the last observations before each one the above policy
+        # looks at.
+        return max(0, self.above.ignores - self._amount + 1)
+
     def begin_episode(self, episode, training):
         super().begin_episode(episode, training)
         self._offset = 0
 
     def observe(self, observ):
         super().observe(observ)
-        self._push(observ)
+        if observ is not None:
+            self._push(observ)
+        if self.above.ignores:
+            return self.above.observe(None)
         observ = self._buffer[:min(self._offset, self._amount)].max(0)
         return self.above.observe(observ)
 
@@ -36,9 +48,28 @@ class Maximum(Partial):
         super().receive(reward, final)
         self.above.receive(reward, final)
 
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._batch_offset = grow_rows(self._batch_offset, index)
+        self._batch_offset[index] = 0
+
+    def observe_batch(self, indices, observs):
+        self._batch_buffer = push_rows(
+            self._batch_buffer, self._batch_offset, indices, observs,
+            self._amount)
+        return self.above.observe_batch(
+            indices, self._batch_buffer[indices].max(1))
+
+    def receive_batch(self, indices, rewards, finals):
+        self.above.receive_batch(indices, rewards, finals)
+
     def _push(self, observ):
+        if self._buffer is None or self._buffer.dtype != observ.dtype:
+            shape = (self._amount,) + observ.shape
+            self._buffer = np.empty(shape, observ.dtype)
         self._buffer[self._offset % self._amount] = observ
         self._offset += 1
 
     def _repeat(self, array):
         return np.ones((self._amount,) + array.shape) * array[np.newaxis, ...]
+
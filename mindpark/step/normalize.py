@@ -3,7 +3,22 @@ from mindpark.step.filter import Filter
 
 class Normalize(Filter):
 
-    def filter(self, observ):
+    """
+    Scale observations into the range from zero to one, converting them to
+    the floating point type of the task.
+    """
+
+    def __init__(self, task):
+        super().__init__(task)
         low, high = self.task.observs.low, self.task.observs.high
-        observ = (observ.astype(float) - low) / (high - low)
+        self._low = low.astype(self.task.dtype)
+        self._scale = (1 / (high - low)).astype(self.task.dtype)
+
+    def filter(self, observ):
+        observ = observ.astype(self.task.dtype)
+        observ -= self._low
+        observ *= self._scale
         return observ
+
+    def filter_batch(self, observs):
+        return self.filter(observs)
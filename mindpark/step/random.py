@@ -1,3 +1,4 @@
+import numpy as np
 from mindpark.core import Policy
 
 
@@ -6,3 +7,12 @@ class Random(Policy):
     def observe(self, observ):
         super().observe(observ)
         return self.task.actions.sample()
+
+    def receive(self, reward, final):
+        super().receive(reward, final)
+
+    def observe_batch(self, indices, observs):
+        return np.array([self.task.actions.sample() for _ in indices])
+
+    def receive_batch(self, indices, rewards, finals):
+        pass
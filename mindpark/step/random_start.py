@@ -17,6 +17,11 @@ class RandomStart(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        # The remaining no-ops are not forwarded to the above policy.
+        return (self._noops or 0) + self.above.ignores
+
     def begin_episode(self, episode, training):
         super().begin_episode(episode, training)
         self._noops = self.random.randint(0, self._max_noop)
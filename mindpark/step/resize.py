@@ -1,27 +1,65 @@
+import numpy as np
 from gym.spaces import Box
-from mindpark.core import Partial
+from mindpark.step.filter import Filter
 
 
-class Resize(Partial):
+class Resize(Filter):
 
-    def __init__(self, task, shape):
+    """
+    Resize the first two axes of observations to the specified height and
+    width. Each resulting pixel is the average over the area it covers in the
+    original observation. Integer observations are rounded back to their type.
+    """
+
+    def __init__(self, task, shape=(84, 84)):
         super().__init__(task)
-        self._shape = shape
+        if len(shape) != 2:
+            raise ValueError('shape must be a height and a width')
+        if len(self.task.observs.shape) < 2:
+            raise ValueError('observations must have at least two axes')
+        if not all(isinstance(x, int) and x > 0 for x in shape):
+            raise ValueError('shape must consist of positive integers')
+        self._shape = tuple(shape)
+        source = self.task.observs.shape[:2]
+        self._factors = [
+            x // y if not x % y else None for x, y in zip(source, shape)]
+        self._weights = [
+            self._area_weights(x, y) for x, y in zip(source, shape)]
 
     @property
-    def interface(self):
-        low = self._apply(self.task.observs.low)
-        high = self._apply(self.task.observs.high)
-        return Box(low, high), self.actions
-
-    def step(self, observ):
-        super().step(observ)
-        observ = self._apply(observ)
-        return self.above.step(observ)
-
-    def experience(self, *transition):
-        super().experience(*transition)
-        self.above.experience(*transition)
-
-    def _apply(self, observ):
-        assert NotImplementedError
+    def above_observs(self):
+        # Averaging stays within the range of the original values.
+        shape = self._shape + self.task.observs.shape[2:]
+        low = np.full(shape, self.task.observs.low.min())
+        high = np.full(shape, self.task.observs.high.max())
+        return Box(low, high)
+
+    def filter(self, observ):
+        if all(self._factors):
+            resized = self._block_mean(observ)
+        else:
+            resized = self._area_mean(observ)
+        if np.issubdtype(observ.dtype, np.integer):
+            resized = np.round(resized).astype(observ.dtype)
+        return resized
+
+    def _block_mean(self, observ):
+        (height, width), (rows, cols) = self._shape, self._factors
+        blocks = observ.reshape((height, rows, width, cols) + observ.shape[2:])
+        return blocks.mean((1, 3))
+
+    def _area_mean(self, observ):
+        rows, cols = self._weights
+        resized = np.tensordot(rows, observ, 1)
+        resized = np.tensordot(cols, resized, (1, 1))
+        return np.swapaxes(resized, 0, 1)
+
+    @staticmethod
+    def _area_weights(source, target):
+        # Fraction of each source cell that each target cell covers.
+        scale = source / target
+        borders = np.arange(target + 1) * scale
+        cells = np.arange(source)
+        lower = np.maximum(borders[:-1, None], cells[None, :])
+        upper = np.minimum(borders[1:, None], cells[None, :] + 1)
+        return np.clip(upper - lower, 0, None) / scale
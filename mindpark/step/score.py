@@ -1,5 +1,7 @@
+import numpy as np
 from mindpark.core import Metric
 from mindpark.step import Identity
+from mindpark.utility import grow_rows
 
 
 class Score(Identity):
@@ -12,6 +14,12 @@ class Score(Identity):
         super().__init__(task)
         self._score_metric = Metric(self.task, 'score', 1)
         self._score = 0
+        self._scores = np.zeros(0)
+
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._scores = grow_rows(self._scores, index)
+        self._scores[index] = 0
 
     def receive(self, reward, final):
         self._score += reward
@@ -19,3 +27,9 @@ class Score(Identity):
             self._score_metric(self._score)
             self._score = 0
         super().receive(reward, final)
+
+    def receive_batch(self, indices, rewards, finals):
+        self._scores[indices] += rewards
+        for score in self._scores[indices[finals]]:
+            self._score_metric(score)
+        super().receive_batch(indices, rewards, finals)
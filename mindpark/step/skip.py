@@ -1,4 +1,6 @@
+import numpy as np
 from mindpark.core import Partial
+from mindpark.utility import grow_rows
 
 
 class Skip(Partial):
@@ -14,6 +16,9 @@ class Skip(Partial):
         # For the modulo operation, we need the step of the current episode,
         # rather than the step of the overall simulation.
         self._step = None
+        self._batch_step = np.zeros(0, int)
+        self._batch_reward = np.zeros(0)
+        self._batch_action = None
 
     @property
     def above_observs(self):
@@ -23,6 +28,13 @@ class Skip(Partial):
     def above_actions(self):
         return self.task.actions
 
+    @property
+    def ignores(self):
+        # Frames until the next shown one, plus the full repeats of shown
+        # frames that the above policy ignores.
+        next_ = 0 if self._step is None else self._step + 1
+        return -next_ % self._amount + self._amount * self.above.ignores
+
     def begin_episode(self, episode, training):
         super().begin_episode(episode, training)
         self._reward = 0
@@ -44,3 +56,39 @@ class Skip(Partial):
         if not (self._step + 1) % self._amount or final:
             self.above.receive(self._reward, final)
             self._reward = 0
+
+    def begin_episode_batch(self, index, episode, training):
+        super().begin_episode_batch(index, episode, training)
+        self._batch_step = grow_rows(self._batch_step, index)
+        self._batch_reward = grow_rows(self._batch_reward, index)
+        self._batch_step[index] = -1
+        self._batch_reward[index] = 0
+
+    def observe_batch(self, indices, observs):
+        self._batch_step[indices] += 1
+        shown = self._batch_step[indices] % self._amount == 0
+        if shown.any():
+            actions = self.above.observe_batch(
+                indices[shown], observs[shown])
+            self._store_actions(indices[shown], actions)
+        return self._batch_action[indices]
+
+    def receive_batch(self, indices, rewards, finals):
+        self._batch_reward[indices] += rewards
+        steps = self._batch_step[indices]
+        shown = ((steps + 1) % self._amount == 0) | finals
+        if shown.any():
+            self.above.receive_batch(
+                indices[shown], self._batch_reward[indices[shown]],
+                finals[shown])
+            self._batch_reward[indices[shown]] = 0
+
+    def _store_actions(self, indices, actions):
+        size = len(self._batch_step)
+        action = self._batch_action
+        if action is None or action.dtype != actions.dtype:
+            action = np.zeros((size,) + actions.shape[1:], actions.dtype)
+        elif len(action) < size:
+            action = grow_rows(action, size - 1)
+        action[indices] = actions
+        self._batch_action = action
@@ -17,3 +17,7 @@ class Subsample(Filter):
             observ = observ[::amount]
             observ = np.moveaxis(observ, 0, -1)
         return observ
+
+    def filter_batch(self, observs):
+        slices = tuple(slice(None, None, x) for x in self._amount)
+        return observs[(slice(None),) + slices]
@@ -2,6 +2,7 @@ from .attrdict import AttrDict
 from .experience import Experience
 from .control import Every, Decay, Statistic
 from .counter import Counter
+from .rwlock import ReadWriteLock
 from .proxy import Proxy
 from .configurable import Configurable
 from .other import *
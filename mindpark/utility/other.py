@@ -164,12 +164,135 @@ def read_yaml(*path):
         return use_attrdicts(yaml.load(file_))
 
 
+def bin_borders(domain, bins):
+    """
+    Indices that split the sorted domain into the number of bins of equal
+    width. Bin i spans the values from borders[i] to borders[i + 1].
+    """
+    edges = np.linspace(domain[0], domain[-1], bins + 1)
+    borders = np.searchsorted(domain, edges, 'left')
+    borders[-1] = len(domain)
+    return borders
+
+
 def aggregate(values, borders, reducer):
-    groups = []
-    for start, stop in zip(borders[:-1], borders[1:]):
-        groups.append(reducer(values[start: stop]))
-    groups = np.array(groups)
-    return groups
+    """
+    Reduce the groups of values between consecutive borders along the first
+    axis. The reducer is 'mean', 'sum', 'count', a percentile between 0 and
+    100 or a list of them, or a function that is called for every group.
+    Except for functions, all groups are reduced at once. Empty groups result
+    in NaN, or zero for sums and counts.
+    """
+    values, borders = np.asarray(values), np.asarray(borders)
+    sizes = np.diff(borders)
+    shape = (len(sizes),) + values.shape[1:]
+    if callable(reducer):
+        groups = np.full(shape, np.nan)
+        for index, (start, stop) in enumerate(zip(borders, borders[1:])):
+            if start < stop:
+                groups[index] = reducer(values[start: stop])
+        return groups
+    if reducer == 'count':
+        return sizes
+    if isinstance(reducer, str) and reducer not in ('sum', 'mean'):
+        raise KeyError("unknown reducer '{}'".format(reducer))
+    if reducer not in ('sum', 'mean'):
+        groups = _grouped_percentile(values, borders, reducer)
+        return groups if np.ndim(reducer) else groups[0]
+    # Values past the last border would be added to the last group.
+    values = values[:borders[-1]]
+    filled = sizes > 0
+    sums = np.zeros(shape)
+    if filled.any():
+        starts = borders[:-1][filled]
+        sums[filled] = np.add.reduceat(values, starts, axis=0)
+    if reducer == 'sum':
+        return sums
+    sizes = sizes.reshape((-1,) + (1,) * (values.ndim - 1))
+    with np.errstate(invalid='ignore'):
+        return sums / sizes
+
+
+def count_categories(indices, borders, categories):
+    """
+    Count how often each category occurs in the groups of integer indices
+    between consecutive borders. Returns an array with one row per group.
+    """
+    sizes = np.diff(borders)
+    indices = np.asarray(indices)[borders[0]: borders[-1]]
+    groups = np.repeat(np.arange(len(sizes)), sizes)
+    counts = np.bincount(
+        groups * categories + indices, minlength=len(sizes) * categories)
+    return counts.reshape((len(sizes), categories))
+
+
+def _grouped_percentile(values, borders, percentiles):
+    # Sort the values within their groups and interpolate between the two
+    # closest ranks, like np.percentile() does for each group. Sorting a
+    # single key that offsets the values by their group is faster than
+    # np.lexsort(). Its rounding can only swap nearly equal values.
+    sizes = np.diff(borders)
+    values = values[borders[0]: borders[-1]]
+    columns = values.reshape((len(values), -1))
+    groups = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+    filled = sizes > 0
+    starts = borders[:-1][filled] - borders[0]
+    percentiles = np.atleast_1d(percentiles).astype(float)
+    result = np.full(
+        (len(percentiles), len(sizes), columns.shape[1]), np.nan)
+    for index, column in enumerate(columns.T):
+        if np.isfinite(column).all():
+            low = column.min()
+            span = 2 * (column.max() - low) + 1
+            order = np.argsort(groups * span + (column - low))
+        else:
+            order = np.lexsort((column, groups))
+        column = column[order]
+        for percentile, output in zip(percentiles, result):
+            position = starts + percentile / 100 * (sizes[filled] - 1)
+            lower = np.floor(position).astype(int)
+            upper = np.ceil(position).astype(int)
+            weight = position - lower
+            output[filled, index] = (
+                (1 - weight) * column[lower] + weight * column[upper])
+    shape = (len(percentiles), len(sizes)) + values.shape[1:]
+    return result.reshape(shape)
+
+
+def grow_rows(array, index, fill=0):
+    """
+    Return the array extended along its first axis so that it has a row for
+    the index. New rows are filled with the value. Used for per environment
+    state of batched policies.
+    """
+    if index < len(array):
+        return array
+    size = max(index + 1, 2 * len(array))
+    grown = np.full((size,) + array.shape[1:], fill, array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def push_rows(buffer, offsets, indices, values, amount, dtype=None):
+    """
+    Push values into per environment ring buffers of the amount of slots.
+    The buffer stacks the environments along its first axis and their slots
+    along its second axis. It is allocated in the dtype, which defaults to
+    the one of the values, if it is None or of another type. The offsets
+    count the values pushed per environment and are advanced in place. The
+    first value of an environment fills all its slots, so that older slots
+    repeat it. Return the buffer, grown to cover all offsets.
+    """
+    dtype = np.dtype(dtype or values.dtype)
+    if buffer is None or buffer.dtype != dtype:
+        buffer = np.zeros((0, amount) + values.shape[1:], dtype)
+    if len(buffer) < len(offsets):
+        buffer = grow_rows(buffer, len(offsets) - 1)
+    first = offsets[indices] == 0
+    buffer[indices[first]] = values[first][:, np.newaxis]
+    buffer[indices, offsets[indices] % amount] = values
+    offsets[indices] += 1
+    return buffer
 
 
 def add_color_bar(ax, img):
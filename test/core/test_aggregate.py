@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from mindpark.core import Metric
+from mindpark.core.aggregate import Reduce, Reservoir, Histogram
+from test.fixtures import *
+
+
+def _select(metric):
+    metric.flush()
+    query = 'SELECT step, {} FROM "{}"'.format(
+        ', '.join(metric.columns), metric.name)
+    return [tuple(x) for x in metric._writer.storage.engine.execute(query)]
+
+
+class TestAggregate:
+
+    def test_reduce_windows_of_steps(self, task):
+        metric = Metric(task, 'mean', 1, aggregate=Reduce(every=4))
+        for step in range(10):
+            advance(task.step, step)
+            metric(step)
+        rows = _select(metric)
+        assert rows == [(3, 1.5), (7, 5.5), (9, 8.5)]
+
+    @pytest.mark.parametrize('reducer, expected', [
+        ('min', [0, 4]), ('max', [3, 5]), ('count', [4, 2])])
+    def test_reducers(self, task, reducer, expected):
+        metric = Metric(task, reducer, 1, aggregate=Reduce(reducer, 4))
+        for step in range(6):
+            advance(task.step, step)
+            metric(step)
+        assert [x[1] for x in _select(metric)] == expected
+
+    @pytest.mark.parametrize('aggregate', [
+        lambda: Reduce(every=4), lambda: Reduce('max', 4),
+        lambda: Reduce('count', 4), lambda: Histogram(3, 4)])
+    def test_extend_matches_calls(self, task, aggregate):
+        metric = Metric(task, 'single', 1, aggregate=aggregate())
+        batched = Metric(task, 'batched', 1, aggregate=aggregate())
+        for step in range(6):
+            advance(task.step, step)
+            values = [step % 3, (step + 1) % 3, 2]
+            for value in values:
+                metric(value)
+            batched.extend(np.array(values))
+        assert _select(batched) == _select(metric)
+
+    def test_unknown_reducer(self):
+        with pytest.raises(KeyError):
+            Reduce('median', 4)
+
+    def test_reservoir_keeps_order_and_size(self, task):
+        metric = Metric(task, 'sample', 1, aggregate=Reservoir(5, 100))
+        for step in range(20):
+            advance(task.step, step)
+            metric(step * 10)
+        rows = _select(metric)
+        assert len(rows) == 5
+        assert rows == sorted(rows)
+        assert all(value == step * 10 for step, value in rows)
+
+    def test_reservoir_samples_uniformly(self):
+        counts = np.zeros(20)
+        for seed in range(500):
+            reservoir = Reservoir(5, 100, seed)
+            for step in range(20):
+                reservoir.add((step, 0, True, 0), [step])
+            rows = reservoir.drain()
+            assert len(rows) == 5
+            for meta, values in rows:
+                assert meta[0] == values[0]
+                counts[int(values[0])] += 1
+        # Each row is kept with probability 5 / 20.
+        assert np.abs(counts / 500 - 0.25).max() < 0.08
+
+    def test_histogram_counts_categories(self, task):
+        metric = Metric(task, 'action', 1, aggregate=Histogram(3, 10))
+        assert metric.columns == ['bin_0', 'bin_1', 'bin_2']
+        for action in [0, 2, 2, 1, 2, 5]:
+            metric(action)
+        assert _select(metric) == [(0, 1, 1, 4)]
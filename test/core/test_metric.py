@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 import sqlalchemy as sql
 from mindpark.core import Metric
+from mindpark.stats.reader import Reader
 from test.fixtures import *
 
 
@@ -35,6 +37,48 @@ class TestMetric:
         actual = [[x[y] for y in metric.columns] for x in rows]
         assert actual == reference
 
+    def test_grow_buffer_in_chunks(self, task):
+        metric = Metric(task, 'metric', 2, chunk=4)
+        reference = [[index, -index] for index in range(10)]
+        for values in reference:
+            metric(*values)
+        metric.flush()
+        rows = self._select_all(task.directory, metric.name)
+        actual = [[x[y] for y in metric.columns] for x in rows]
+        assert actual == reference
+
+    def test_extend_matches_calls(self, task):
+        metric = Metric(task, 'metric', 2, chunk=4)
+        reference = [[index, -index] for index in range(10)]
+        metric.extend(np.array(reference[:3]))
+        metric.extend(np.array(reference[3:]))
+        metric.flush()
+        rows = self._select_all(task.directory, metric.name)
+        actual = [[x[y] for y in metric.columns] for x in rows]
+        assert actual == reference
+
+    def test_vector_stored_as_single_column(self, task):
+        metric = Metric(task, 'vector', 3, vector=True)
+        reference = np.random.uniform(-1, 1, (5, 3)).astype(np.float32)
+        for values in reference:
+            task.step.increment()
+            metric(values)
+        metric.flush()
+        rows = list(self._select_all(task.directory, metric.name))
+        assert all(len(x) == 7 for x in rows)
+        filename = '{}/stats.db'.format(task.directory)
+        (name, columns), = Reader(['vector'])(filename)
+        assert columns.data.shape == (5, 3)
+        assert columns.data.dtype == np.float32
+        assert (columns.data == reference).all()
+
+    def test_vector_needs_single_array(self, task):
+        metric = Metric(task, 'vector', 3, vector=True)
+        with pytest.raises(ValueError):
+            metric(1, 2, 3)
+        with pytest.raises(ValueError):
+            metric([1, 2])
+
     def test_need_at_least_one_column(self, task):
         with pytest.raises(ValueError):
             Metric(task, 'metric', 0)
@@ -0,0 +1,76 @@
+import time
+import numpy as np
+from mindpark.core import Profiler
+from mindpark.stats.reader import Reader
+from test.mocks import Sequential, Identity, Random
+from test.fixtures import *
+
+
+class Slow(Identity):
+
+    def observe(self, observ):
+        time.sleep(0.01)
+        return super().observe(observ)
+
+
+def simulate(policy, env):
+    policy.begin_episode(0, True)
+    observ = env.reset()
+    while observ is not None:
+        action = policy.observe(observ)
+        reward, observ = env.step(action)
+        policy.receive(reward, observ is None)
+    policy.end_episode()
+
+
+class TestProfiler:
+
+    def test_measure_all_steps(self, env, policy):
+        profiler = Profiler()
+        policy.profile(profiler)
+        simulate(policy, env)
+        names = {x[0] for x in profiler.timings.keys()}
+        assert len(names) == len(policy.recursive_steps) + 1
+        calls = {k: v[0] for k, v in profiler.timings.items()}
+        assert calls[('0_sequential', 'observe')] == env.duration
+        assert calls[('0_sequential', 'begin_episode')] == 1
+
+    def test_exclude_time_of_above_steps(self, task):
+        env = DurationEnv(5)
+        policy = Sequential(task)
+        policy.add(Identity)
+        policy.add(Slow)
+        policy.add(Random)
+        profiler = Profiler()
+        policy.profile(profiler)
+        simulate(policy, env)
+        timings = profiler.timings
+        assert list(timings.keys())[0] == ('2_slow', 'observe')
+        assert timings[('1_identity', 'observe')][1] < 0.01
+
+    def test_uninstall(self, env, policy):
+        profiler = Profiler()
+        policy.profile(profiler)
+        policy.profile(None)
+        simulate(policy, env)
+        assert not profiler.timings
+
+    def test_write_metrics(self, env, task, policy):
+        profiler = Profiler()
+        policy.profile(profiler)
+        simulate(policy, env)
+        profiler.write(task)
+        assert profiler.format().count('\n') == len(profiler.timings)
+        filename = '{}/stats.db'.format(task.directory)
+        metrics = dict(Reader(['profile/'])(filename))
+        names = {x[0] for x in profiler.timings.keys()}
+        assert set(metrics.keys()) == {'profile/' + x for x in names}
+        for name, metric in metrics.items():
+            assert metric.data.shape == (1, len(Profiler.METHODS))
+            assert (metric.data >= 0).all()
+            for index, method in enumerate(Profiler.METHODS):
+                key = name[len('profile/'):], method
+                if key not in profiler.timings:
+                    continue
+                calls, duration = profiler.timings[key]
+                assert np.isclose(metric.data[0, index], duration / calls)
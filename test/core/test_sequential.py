@@ -1,5 +1,5 @@
 import pytest
-from test.mocks import Sequential, Identity, Skip, Random
+from test.mocks import Sequential, Identity, Skip, Random, Image
 from test.fixtures import *
 
 
@@ -73,3 +73,42 @@ class TestSequential:
             assert actual == references
             timestep += 1
         policy.end_episode()
+
+    def test_forward_none_for_ignored_observs(self, env, task):
+        policy = Sequential(task)
+        policy.add(Image)
+        inner = Sequential(policy.above_task)
+        inner.add(Identity)
+        inner.add(Skip, 3)
+        policy.add(inner)
+        policy.add(Random)
+        policy.begin_episode(0, True)
+        timestep = 0
+        observ = env.reset()
+        while observ is not None:
+            action = policy.observe(observ)
+            ignored = bool(timestep % 3)
+            assert policy.steps[0].observ is not None
+            assert (inner.steps[0].observ is None) == ignored
+            assert (inner.steps[1].observ is None) == ignored
+            assert policy.steps[-1].observ is not None
+            reward, observ = env.step(action)
+            policy.receive(reward, observ is None)
+            timestep += 1
+        policy.end_episode()
+
+    def test_optimize_validates_at_boundary(self, env, policy):
+        policy.optimize()
+        assert policy.validate
+        assert not any(x.validate for x in policy.recursive_steps)
+        policy.begin_episode(0, True)
+        observ = env.reset()
+        while observ is not None:
+            action = policy.observe(observ)
+            reward, observ = env.step(action)
+            policy.receive(reward, observ is None)
+        with pytest.raises(RuntimeError):
+            policy.receive(0, True)
+        policy.end_episode()
+        policy.optimize(False)
+        assert all(x.validate for x in policy.recursive_steps)
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+from mindpark.core import Metric, MetricWriter
+from mindpark.core.storage import ColumnStorage
+from mindpark.stats.convert import convert
+from mindpark.stats.reader import Reader
+from test.fixtures import *
+
+
+def _fill(task, name, rows):
+    metric = Metric(task, name, ['first', 'second'])
+    for index in range(rows):
+        advance(task.step, index)
+        metric(index, -index)
+    metric.flush()
+
+
+class TestColumnStorage:
+
+    def test_read_memory_mapped_columns(self, task):
+        MetricWriter.get(task.directory, backend='columns')
+        _fill(task, 'some/metric', 5)
+        folder = os.path.join(task.directory, ColumnStorage.FOLDER)
+        (name, metric), = Reader()(folder)
+        assert name == 'some/metric'
+        assert (metric.step == np.arange(5)).all()
+        assert metric.data.tolist() == [[x, -x] for x in range(5)]
+        path = ColumnStorage.filepath(folder, '0', 'step')
+        assert isinstance(np.load(path, mmap_mode='r'), np.memmap)
+
+    def test_append_to_existing_files(self, task):
+        storage = ColumnStorage(task.directory)
+        handle = storage.create('metric', ['value'])
+        for index in range(3):
+            meta = np.full((2, 4), index, np.int64)
+            storage.write([(handle, None, meta, np.ones((2, 1)) * index)])
+        assert ColumnStorage(task.directory).create('metric', ['value'])
+        (_, metric), = Reader()(storage.directory)
+        assert metric.data[:, 0].tolist() == [0, 0, 1, 1, 2, 2]
+
+    def test_convert_both_ways(self, task):
+        _fill(task, 'metric', 4)
+        convert(task.directory, 'columns')
+        os.rename(
+            os.path.join(task.directory, 'stats.db'),
+            os.path.join(task.directory, 'original.db'))
+        convert(task.directory, 'sqlite', lean=True)
+        original = dict(Reader()(os.path.join(task.directory, 'original.db')))
+        converted = dict(Reader()(os.path.join(task.directory, 'stats.db')))
+        for key in ('step', 'epoch', 'training', 'episode', 'data'):
+            assert (original['metric'][key] == converted['metric'][key]).all()
+
+    def test_vector_file_has_two_axes(self, task):
+        MetricWriter.get(task.directory, backend='columns')
+        metric = Metric(task, 'values', 4, vector=True)
+        for index in range(3):
+            metric(np.arange(4) + index)
+        metric.flush()
+        folder = os.path.join(task.directory, ColumnStorage.FOLDER)
+        path = ColumnStorage.filepath(folder, '0', 'vector')
+        assert np.load(path).shape == (3, 4)
+        (_, columns), = Reader()(folder)
+        assert columns.data.tolist() == [
+            list(range(x, x + 4)) for x in range(3)]
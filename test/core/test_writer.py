@@ -0,0 +1,99 @@
+import time
+import numpy as np
+import pytest
+import sqlalchemy as sql
+from mindpark.core import Metric, MetricWriter
+from test.fixtures import *
+
+
+class TestMetricWriter:
+
+    def test_shared_per_directory(self, task):
+        first = Metric(task, 'first', 1)
+        second = Metric(task, 'second', 1)
+        assert first._writer is second._writer
+        assert MetricWriter.get(task.directory) is first._writer
+
+    def test_flush_buffers_of_all_metrics(self, task):
+        metrics = [Metric(task, 'metric_{}'.format(x), 1) for x in range(3)]
+        for index, metric in enumerate(metrics):
+            for _ in range(index + 1):
+                metric(index)
+        MetricWriter.get(task.directory).flush()
+        filepath = 'sqlite:///{}/stats.db'.format(task.directory)
+        engine = sql.create_engine(filepath)
+        for index, metric in enumerate(metrics):
+            query = 'SELECT value_0 FROM "{}"'.format(metric.name)
+            rows = [x[0] for x in engine.execute(query)]
+            assert rows == [index] * (index + 1)
+
+    def test_bounded_queue(self, task):
+        writer = MetricWriter(task.directory, capacity=2)
+        handle = writer.create('metric', ['value'])
+        meta = np.zeros((10, 4), np.int64)
+        for index in range(10):
+            values = np.arange(10)[:, None] + 10 * index
+            writer.write(handle, None, meta, values)
+            assert writer._queue.qsize() <= 2
+        writer.wait()
+
+    def test_lean_layout(self, task):
+        MetricWriter.get(task.directory, lean=True)
+        metric = Metric(task, 'lean', 2)
+        metric(1, 2)
+        metric(3, 4)
+        metric.flush()
+        MetricWriter.get(task.directory, lean=False)
+        storage = MetricWriter.get(task.directory).storage
+        assert storage.lean_layout('lean')
+        Metric(task, 'regular', 2)
+        assert not storage.lean_layout('regular')
+        filepath = 'sqlite:///{}/stats.db'.format(task.directory)
+        engine = sql.create_engine(filepath)
+        rows = list(engine.execute('SELECT * FROM lean ORDER BY id'))
+        assert [x[0] for x in rows] == [1, 2]
+        assert all(isinstance(x[1], float) for x in rows)
+        assert [list(x[-2:]) for x in rows] == [[1, 2], [3, 4]]
+
+    def test_scheduler_flushes_idle_metrics(self, task, monkeypatch):
+        monkeypatch.setattr(MetricWriter, 'TICK', 0.01)
+        metric = Metric(task, 'idle', 1, flush_interval=0.05)
+        metric(42)
+        writer = MetricWriter.get(task.directory)
+        for _ in range(200):
+            if not metric._size:
+                break
+            time.sleep(0.01)
+        writer.wait()
+        engine = writer.storage.engine
+        rows = [x[0] for x in engine.execute('SELECT value_0 FROM idle')]
+        assert rows == [42]
+
+    def test_flush_when_buffer_full(self, task):
+        metric = Metric(task, 'full', 1, chunk=2, max_rows=4)
+        for index in range(10):
+            metric(index)
+            assert metric._size < 4
+        assert len(metric._meta) <= 4
+
+    def test_flush_dropped_metrics(self, task):
+        metric = Metric(task, 'dropped', 1)
+        metric(42)
+        del metric
+        writer = MetricWriter.get(task.directory)
+        writer.wait()
+        engine = writer.storage.engine
+        rows = [x[0] for x in engine.execute('SELECT value_0 FROM dropped')]
+        assert rows == [42]
+
+    def test_dropped_metrics_keep_stored_errors(self, task):
+        writer = MetricWriter.get(task.directory)
+        metric = Metric(task, 'dropped', 1)
+        metric(42)
+        writer._error = ValueError('failed to write earlier rows')
+        del metric
+        with pytest.raises(ValueError):
+            writer.wait()
+        engine = writer.storage.engine
+        rows = [x[0] for x in engine.execute('SELECT value_0 FROM dropped')]
+        assert rows == [42]
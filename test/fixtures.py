@@ -1,11 +1,59 @@
 import pytest
+from gym.spaces import Box, Discrete
 import mindpark.algorithm
-from mindpark.core import Task
-from mindpark.utility import use_attrdicts
+from mindpark.core import Metric, Task
+from mindpark.utility import Counter, dump_yaml, use_attrdicts
 from test.mocks import Sequential, Identity, Skip, Random
 from test.mocks import DurationEnv, MockViewer
 
 
+def advance(counter, value):
+    """
+    Increment a counter of the task until it reaches the value.
+    """
+    while counter < value:
+        counter.increment()
+
+
+def counter_at(value):
+    """
+    New counter for a task that starts at the value, so that tests can move
+    the time of a task backwards.
+    """
+    counter = Counter()
+    advance(counter, value)
+    return counter
+
+
+@pytest.fixture
+def write_run():
+    """
+    Function that writes the algorithm definition and metrics of a run to a
+    directory. Rows are tuples of training flag, epoch, step, episode, and
+    value, ordered in time per training flag. The value of a row is written
+    to each of the named metrics.
+    """
+    def write(directory, rows, names=('score',), algorithm='Algo'):
+        dump_yaml({'name': algorithm}, directory, 'algorithm.yaml')
+        tasks, metrics = {}, {}
+        for training, epoch, step, episode, value in rows:
+            if training not in tasks:
+                tasks[training] = Task(
+                    Box(0, 1, (2,)), Discrete(2), directory, 1000, 3,
+                    training)
+                metrics[training] = [
+                    Metric(tasks[training], x, 1) for x in names]
+            task = tasks[training]
+            advance(task.epoch, epoch)
+            advance(task.step, step)
+            advance(task.episode, episode)
+            for metric in metrics[training]:
+                metric(value)
+        for metric in sum(metrics.values(), []):
+            metric.flush()
+    return write
+
+
 @pytest.fixture(params=[1, 2, 17])
 def duration(request):
     return request.param
@@ -73,6 +73,10 @@ class Random(Monitored, step.Random):
     pass
 
 
+class Image(Monitored, step.Image):
+    pass
+
+
 class MockViewer:
 
     def __init__(self, *args, **kwargs):
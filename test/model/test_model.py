@@ -0,0 +1,62 @@
+import threading
+import numpy as np
+import pytest
+import tensorflow as tf
+from mindpark.model import Model
+
+
+def _create(model):
+    model.set_optimizer(tf.train.RMSPropOptimizer(0.1))
+    state = model.add_input('state', 3)
+    target = model.add_input('target', 2)
+    weights = tf.Variable(tf.constant(
+        np.arange(6).reshape((3, 2)) / 6, tf.float32))
+    value = model.add_output('value', tf.matmul(state, weights))
+    model.add_cost('cost', (value - target) ** 2)
+
+
+class TestModel:
+
+    @pytest.mark.parametrize('locking', [False, True])
+    def test_train_matches_delta_and_apply(self, locking):
+        fused, separate = Model(_create, locking=locking), Model(_create)
+        random = np.random.RandomState(0)
+        for _ in range(3):
+            state = random.normal(0, 1, (8, 3))
+            target = random.normal(0, 1, (8, 2))
+            cost = fused.train('cost', state=state, target=target)
+            delta, expected = separate.delta(
+                'cost', state=state, target=target)
+            separate.apply(delta)
+            assert np.isclose(cost, expected)
+        for name, value in fused.weights.items():
+            assert np.allclose(value, separate.weights[name])
+
+    def test_train_batches(self):
+        model = Model(_create)
+        state = np.ones((10, 3))
+        target = np.zeros((10, 2))
+        before = model.compute('value', state=state)
+        model.train('cost', batch=4, epochs=2, state=state, target=target)
+        after = model.compute('value', state=state)
+        assert (np.abs(after) < np.abs(before)).all()
+
+    def test_compute_from_threads(self):
+        model = Model(_create, locking=True)
+        state = np.ones((4, 3))
+        target = np.zeros((4, 2))
+        expected = model.compute('value', state=state)
+        results = []
+
+        def compute():
+            for _ in range(20):
+                results.append(model.compute('value', state=state))
+
+        threads = [threading.Thread(target=compute) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(np.allclose(x, expected) for x in results)
+        model.train('cost', state=state, target=target)
+        assert not np.allclose(model.compute('value', state=state), expected)
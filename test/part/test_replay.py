@@ -44,6 +44,11 @@ class TestRingBuffer:
         assert (memory[8:][0] == [8, 9, 10, 11]).all()
         assert (memory[-4:][0] == [8, 9, 10, 11]).all()
 
+    def test_columns_use_dtype(self):
+        memory = mp.part.replay.RingBuffer(5, [[], [2]], np.float16)
+        memory.push(1, [2, 3])
+        assert all(x.dtype == np.float16 for x in memory[:])
+
 
 class TestSequential:
 
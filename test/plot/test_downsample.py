@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import matplotlib.pyplot as plt
+from mindpark.plot import Lines, lttb, envelope, sample
+
+
+@pytest.fixture
+def line():
+    random = np.random.RandomState(0)
+    domain = np.sort(random.uniform(0, 100, 10000))
+    values = np.sin(domain / 10) + random.normal(0, 0.1, len(domain))
+    values[1234] = 5
+    return domain, values
+
+
+class TestLttb:
+
+    def test_keep_ends_and_peaks(self, line):
+        domain, values = line
+        indices = lttb(domain, values, 200)
+        assert len(indices) == 200
+        assert indices[0] == 0 and indices[-1] == len(domain) - 1
+        assert (np.diff(indices) > 0).all()
+        assert 1234 in indices
+
+    def test_short_lines_unchanged(self, line):
+        domain, values = line
+        assert len(lttb(domain[:50], values[:50], 100)) == 50
+
+
+class TestEnvelope:
+
+    def test_extremes_per_column(self, line):
+        domain, values = line
+        indices = envelope(domain, values, 10)
+        assert len(indices) == 20
+        assert values.argmax() in indices
+        assert values.argmin() in indices
+        kept = np.zeros(len(domain), bool)
+        kept[indices] = True
+        columns = (domain - domain.min()) / np.ptp(domain) * 10
+        columns = np.minimum(columns.astype(int), 9)
+        for column in range(10):
+            mask = columns == column
+            assert values[mask & kept].max() == values[mask].max()
+            assert values[mask & kept].min() == values[mask].min()
+
+
+class TestSample:
+
+    def test_target_count_with_outline(self, line):
+        domain, values = line
+        indices = sample(domain, values, 1000)
+        assert 900 <= len(indices) <= 1000
+        assert values.argmax() in indices
+        assert values.argmin() in indices
+        assert (np.diff(indices) > 0).all()
+
+
+class TestLines:
+
+    def test_raw_line_reduced_to_points(self, line):
+        domain, values = line
+        fig, ax = plt.subplots()
+        Lines(resolution=None, points=100)(ax, {'a': domain}, {'a': values})
+        vertices = ax.lines[0].get_xydata()
+        plt.close(fig)
+        assert len(vertices) <= 100
+        assert vertices[:, 1].max() == values.max()
+        assert vertices[0, 0] == domain[0] and vertices[-1, 0] == domain[-1]
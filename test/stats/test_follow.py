@@ -0,0 +1,46 @@
+import os
+import pytest
+from mindpark.core import MetricWriter
+from mindpark.stats.follow import Follow
+from test.fixtures import *
+
+
+@pytest.fixture(params=['sqlite', 'columns'])
+def run(request, tmpdir, write_run):
+    experiment = os.path.join(str(tmpdir), 'experiment')
+    directory = os.path.join(experiment, 'Env', 'Algo-1')
+    MetricWriter.get(directory, lean=True, backend=request.param)
+
+    def write(epoch, values):
+        write_run(directory, [(True, epoch, 0, 0, x) for x in values])
+
+    return experiment, write
+
+
+class TestFollow:
+
+    def test_summarize_latest_epoch(self, run):
+        experiment, write = run
+        follow = Follow()
+        write(0, [1, 2, 3])
+        follow.poll([experiment])
+        (summary,) = follow.summaries().values()
+        assert summary.phases[True] == [0, 3, 6, 1, 3]
+        write(0, [4])
+        follow.poll([experiment])
+        assert summary.phases[True] == [0, 4, 10, 1, 4]
+        write(1, [5, 7])
+        follow.poll([experiment])
+        assert summary.phases[True] == [1, 2, 12, 5, 7]
+        assert False not in summary.phases
+
+    def test_read_only_new_rows(self, run):
+        experiment, write = run
+        follow = Follow()
+        write(0, [1, 2])
+        follow.poll([experiment])
+        follow.poll([experiment])
+        (summary,) = follow.summaries().values()
+        assert summary.phases[True][1] == 2
+        (position,) = follow._positions.values()
+        assert position == 2
@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pytest
+from mindpark.stats.index import Index
+from test.fixtures import *
+
+
+def _scores(epoch, scores):
+    return [
+        (False, epoch, 10 * epoch + index, 0, score)
+        for index, score in enumerate(scores)]
+
+
+@pytest.fixture
+def root(tmpdir, write_run):
+    root = str(tmpdir)
+    for repeat in (1, 2):
+        name = 'Good-{}'.format(repeat)
+        directory = os.path.join(root, 'first', 'Env', name)
+        scores = _scores(0, [1, 2, 3, 4 + repeat])
+        write_run(directory, scores, algorithm='Good')
+    directory = os.path.join(root, 'second', 'Env', 'Bad-1')
+    write_run(directory, _scores(0, [0, 1]), algorithm='Bad')
+    return root
+
+
+class TestIndex:
+
+    def test_epoch_statistics(self, root):
+        index = Index(os.path.join(root, 'index.db'))
+        experiments = [os.path.join(root, x) for x in ('first', 'second')]
+        assert index.update(experiments) == 3
+        rows = list(index.engine.execute(
+            'SELECT r.repeat, e.* FROM runs AS r JOIN epochs AS e '
+            'ON e.run = r.id WHERE r.algorithm = "Good" ORDER BY r.repeat'))
+        assert [x['episodes'] for x in rows] == [4, 4]
+        assert [x['step'] for x in rows] == [3, 3]
+        assert [x['max'] for x in rows] == [5, 6]
+        assert rows[0]['mean'] == 2.75
+        assert rows[0]['p50'] == np.percentile([1, 2, 3, 5], 50)
+
+    def test_update_changed_runs(self, root, write_run):
+        index = Index(os.path.join(root, 'index.db'))
+        experiments = [os.path.join(root, x) for x in ('first', 'second')]
+        index.update(experiments)
+        assert index.update(experiments) == 0
+        directory = os.path.join(root, 'second', 'Env', 'Bad-1')
+        write_run(directory, _scores(0, [2]), algorithm='Bad')
+        write_run(directory, _scores(1, [7, 9]), algorithm='Bad')
+        assert index.update(experiments) == 1
+        rows = list(index.engine.execute(
+            'SELECT epoch, episodes, mean FROM epochs AS e JOIN runs AS r '
+            'ON e.run = r.id WHERE r.algorithm = "Bad" ORDER BY epoch'))
+        assert [tuple(x) for x in rows] == [(0, 3, 1), (1, 2, 8)]
+
+    def test_leaderboard(self, root):
+        index = Index(os.path.join(root, 'index.db'))
+        index.update([os.path.join(root, x) for x in ('first', 'second')])
+        board = index.leaderboard()
+        expected = [('Env', 'Good', 2), ('Env', 'Bad', 1)]
+        assert [x[:3] for x in board] == expected
+        assert board[0][3] == 2.875
@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pytest
+from mindpark.core import Metric, MetricWriter
+from mindpark.core.storage import ColumnStorage
+from mindpark.stats.reader import Reader
+from test.fixtures import *
+
+
+@pytest.fixture(params=['sqlite', 'columns'])
+def stats(request, task):
+    MetricWriter.get(task.directory, backend=request.param)
+    metric = Metric(task, 'metric', ['first', 'second'])
+    for epoch in range(4):
+        advance(task.epoch, epoch)
+        # Write steps in reverse, so that reading has to sort them.
+        for step in reversed(range(5)):
+            task.step = counter_at(step)
+            metric(epoch, step)
+    metric.flush()
+    if request.param == 'columns':
+        return os.path.join(task.directory, ColumnStorage.FOLDER)
+    return os.path.join(task.directory, 'stats.db')
+
+
+class TestReader:
+
+    def test_sorted_typed_columns(self, stats):
+        (_, metric), = Reader(chunk=3)(stats)
+        assert metric.step.dtype == np.int64
+        assert metric.data.dtype == np.float64
+        assert metric.epoch.tolist() == [x // 5 for x in range(20)]
+        assert metric.step.tolist() == list(range(5)) * 4
+        assert metric.data[:, 1].tolist() == list(range(5)) * 4
+
+    def test_filter_epochs_and_columns(self, stats):
+        reader = Reader(epochs=(1, 3), columns=['second'], chunk=4)
+        (_, metric), = reader(stats)
+        assert metric.data.shape == (10, 1)
+        assert metric.epoch.tolist() == [x // 5 + 1 for x in range(10)]
+        assert metric.data[:, 0].tolist() == list(range(5)) * 2
+
+    def test_filter_training(self, stats, task):
+        (_, metric), = Reader(training=task.training)(stats)
+        assert len(metric.step) == 20
+        assert not list(Reader(training=not task.training)(stats))
+
+    def test_skip_metrics_without_columns(self, stats):
+        assert not list(Reader(columns=['unknown'])(stats))
+
+    def test_reduce_step_bins(self, stats):
+        (_, metric), = Reader(resolution=2, epochs=(1, None))(stats)
+        assert metric.epoch.tolist() == [1, 1, 2, 2, 3, 3]
+        assert metric.count.tolist() == [3, 2] * 3
+        assert metric.step.tolist() == [1, 3] * 3
+        assert metric.data[:, 1].tolist() == [1, 3.5] * 3
+        assert metric.minimum[:, 1].tolist() == [0, 3] * 3
+        assert metric.maximum[:, 1].tolist() == [2, 4] * 3
+        assert (metric.data[:, 0] == metric.epoch).all()
+
+    def test_reduce_vector_bins(self, task):
+        metric = Metric(task, 'vector', 2, vector=True)
+        for step in range(6):
+            advance(task.step, step)
+            metric(np.array([step, -step]))
+        metric.flush()
+        filepath = os.path.join(task.directory, 'stats.db')
+        (_, metric), = Reader(resolution=3)(filepath)
+        assert metric.count.tolist() == [2, 2, 2]
+        assert metric.data.tolist() == [[.5, -.5], [2.5, -2.5], [4.5, -4.5]]
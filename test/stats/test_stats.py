@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import pytest
+from mindpark.stats.stats import Stats
+from test.fixtures import *
+
+
+def _rows(episodes):
+    rows = []
+    for training in (True, False):
+        for step in range(300):
+            episode = step * episodes // 300
+            value = np.random.rand()
+            rows.append((training, step // 100, step, episode, value))
+    return rows
+
+
+@pytest.fixture
+def experiment(tmpdir, write_run):
+    experiment = os.path.join(str(tmpdir), 'experiment')
+    names = ('score', 'other')
+    write_run(os.path.join(experiment, 'Env', 'Algo-1'), _rows(30), names)
+    # A single episode can't be plotted over episodes.
+    write_run(os.path.join(experiment, 'Env', 'Algo-2'), _rows(1), names)
+    return experiment
+
+
+class TestStats:
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_collect_failures_per_run(self, experiment, jobs):
+        failures = Stats('png', jobs=jobs)(experiment)
+        assert [x for x, _ in failures] == ['Algo on Env (Repeat 2)']
+        files = os.listdir(experiment)
+        assert 'Experiment-Env-Algo-1.png' in files
+        assert 'experiment.png' in files
+
+    def test_skip_plots_that_are_up_to_date(
+            self, experiment, capsys, write_run):
+        Stats('png')(experiment)
+        capsys.readouterr()
+        Stats('png')(experiment)
+        output = capsys.readouterr()[0]
+        assert 'Skip run Algo on Env (Repeat 1)' in output
+        assert 'Skip scores' in output
+        # The failed run has no plot and is tried again.
+        assert 'Plot run Algo on Env (Repeat 2)' in output
+        directory = os.path.join(experiment, 'Env', 'Algo-1')
+        write_run(directory, _rows(30), ('score', 'other'))
+        Stats('png')(experiment)
+        output = capsys.readouterr()[0]
+        assert 'Plot run Algo on Env (Repeat 1)' in output
+        assert 'Skip scores' not in output
+        Stats('png', force=True)(experiment)
+        assert 'Skip' not in capsys.readouterr()[0]
+
+    def test_cache_depends_on_resolution(self, experiment, capsys):
+        Stats('png')(experiment)
+        capsys.readouterr()
+        Stats('png', resolution=10)(experiment)
+        assert 'Skip' not in capsys.readouterr()[0]
@@ -1,6 +1,10 @@
 import pytest
+import numpy as np
+import gym.spaces
+from gym.spaces import Box, Discrete
 import mindpark.step
-from mindpark.core import Sequential
+from mindpark.core import Sequential, MetricWriter, Task
+from mindpark.stats.reader import Reader
 from test.mocks import Random
 from test.fixtures import *
 
@@ -8,7 +12,7 @@ from test.fixtures import *
 STEPS = [
     'Identity', 'Maximum', 'Delta', 'Grayscale', 'Subsample', 'Skip',
     'History', 'Normalize', 'ClampReward', 'EpsilonGreedy', 'RandomStart',
-    'ActionSample', 'ActionMax', 'Score', 'Image']
+    'ActionSample', 'ActionMax', 'Score', 'Image', 'Resize']
 
 
 @pytest.fixture(params=STEPS)
@@ -37,3 +41,312 @@ class TestStep:
             reward, observ = env.step(action)
             policy.receive(reward, observ is None)
         policy.end_episode()
+
+
+class TestGrayscale:
+
+    def test_uint8_close_to_float(self, task):
+        task.observs = Box(0, 255, (8, 6, 3))
+        grayscale = mindpark.step.Grayscale(task)
+        observ = np.random.randint(0, 256, (8, 6, 3)).astype(np.uint8)
+        gray = grayscale.filter(observ)
+        assert gray.dtype == np.uint8
+        reference = grayscale.filter(observ.astype(float))
+        assert np.abs(gray - reference).max() <= 1
+
+    def test_uint8_keeps_range(self, task):
+        task.observs = Box(0, 255, (8, 6, 3))
+        grayscale = mindpark.step.Grayscale(task)
+        black = np.zeros((8, 6, 3), np.uint8)
+        white = np.full((8, 6, 3), 255, np.uint8)
+        assert (grayscale.filter(black) == 0).all()
+        assert (grayscale.filter(white) == 255).all()
+
+    def test_batches_of_varying_size(self, task):
+        task.observs = Box(0, 255, (8, 6, 3))
+        grayscale = mindpark.step.Grayscale(task)
+        observs = np.random.randint(0, 256, (5, 8, 6, 3)).astype(np.uint8)
+        single = grayscale._buffer
+        for count in (5, 2, 4):
+            batch = grayscale.filter_batch(observs[:count])
+            expected = [grayscale.filter(x) for x in observs[:count]]
+            assert np.array_equal(batch, expected)
+        assert grayscale._buffer is single
+
+
+class TestResize:
+
+    def test_integer_ratio_block_mean(self, task):
+        task.observs = Box(0, 255, (8, 6, 3))
+        resize = mindpark.step.Resize(task, (4, 3))
+        observ = np.random.uniform(0, 255, (8, 6, 3))
+        reference = observ.reshape((4, 2, 3, 2, 3)).mean((1, 3))
+        assert np.allclose(resize.filter(observ), reference)
+
+    def test_area_mean_keeps_average(self, task):
+        task.observs = Box(0, 255, (8, 6))
+        resize = mindpark.step.Resize(task, (5, 4))
+        observ = np.random.uniform(0, 255, (8, 6))
+        resized = resize.filter(observ)
+        assert resized.shape == (5, 4)
+        assert np.allclose(resized.mean(), observ.mean())
+
+    def test_integer_observations_keep_type(self, task):
+        task.observs = Box(0, 255, (8, 6))
+        resize = mindpark.step.Resize(task, (3, 5))
+        observ = np.full((8, 6), 255, np.uint8)
+        resized = resize.filter(observ)
+        assert resized.dtype == np.uint8
+        assert (resized == 255).all()
+        assert resize.above_observs.contains(resized)
+
+
+class TestNormalize:
+
+    def test_convert_to_task_dtype(self, task):
+        task.observs = Box(0, 255, (8, 6))
+        normalize = mindpark.step.Normalize(task)
+        observ = np.random.randint(0, 256, (8, 6)).astype(np.uint8)
+        normalized = normalize.filter(observ)
+        assert normalized.dtype == task.dtype
+        assert np.allclose(normalized, observ / 255)
+        assert normalize.above_observs.contains(normalized)
+
+
+class Record(mindpark.core.Policy):
+
+    def __init__(self, task):
+        super().__init__(task)
+        self.observs = []
+        self.rewards = []
+        self.batch_observs = {}
+        self.batch_rewards = {}
+
+    def observe(self, observ):
+        super().observe(observ)
+        self.observs.append(observ)
+        return 1
+
+    def receive(self, reward, final):
+        super().receive(reward, final)
+        self.rewards.append(reward)
+
+    def observe_batch(self, indices, observs):
+        for index, observ in zip(indices, observs):
+            self.batch_observs.setdefault(index, []).append(observ)
+        return np.ones(len(indices), int)
+
+    def receive_batch(self, indices, rewards, finals):
+        for index, reward in zip(indices, rewards):
+            self.batch_rewards.setdefault(index, []).append(reward)
+
+
+class Values(mindpark.core.Policy):
+
+    def observe(self, observ):
+        super().observe(observ)
+        return observ
+
+    def receive(self, reward, final):
+        super().receive(reward, final)
+
+    def observe_batch(self, indices, observs):
+        return observs
+
+    def receive_batch(self, indices, rewards, finals):
+        pass
+
+
+class TestDelta:
+
+    def _policy(self, task):
+        policy = Sequential(task)
+        policy.add(mindpark.step.Delta)
+        policy.add(Record)
+        return policy
+
+    def test_difference_without_aliasing(self, task):
+        task.observs = Box(0, 255, (4, 3))
+        policy = self._policy(task)
+        record = policy.steps[-1]
+        first = np.random.randint(0, 256, (4, 3)).astype(np.uint8)
+        second = np.random.randint(0, 256, (4, 3)).astype(np.uint8)
+        expected = second.astype(task.dtype) - first.astype(task.dtype)
+        policy.begin_episode(0, True)
+        policy.observe(first)
+        policy.receive(0, False)
+        first[:] = 0
+        policy.observe(second)
+        policy.receive(0, True)
+        policy.end_episode()
+        zeros, difference = record.observs
+        assert difference.dtype == task.dtype
+        assert np.allclose(difference, expected)
+        assert (zeros == 0).all()
+
+    def test_fresh_zeros_at_episode_start(self, task):
+        task.observs = Box(0, 1, (4, 3))
+        policy = self._policy(task)
+        record = policy.steps[-1]
+        for episode in range(2):
+            policy.begin_episode(episode, True)
+            policy.observe(np.ones((4, 3)))
+            policy.receive(0, True)
+            policy.end_episode()
+        first, second = record.observs
+        assert first is not second
+        first += 1
+        assert (second == 0).all()
+
+    def test_batch_per_environment(self, task):
+        task.observs = Box(0, 255, (4, 3))
+        policy = self._policy(task)
+        delta, record = policy.steps
+        observs = np.random.randint(0, 256, (4, 3, 4, 3)).astype(np.uint8)
+        for index in range(3):
+            delta.begin_episode_batch(index, 0, True)
+        delta.observe_batch(np.array([0, 1, 2]), observs[0])
+        delta.observe_batch(np.array([2, 0]), observs[1][[2, 0]])
+        delta.observe_batch(np.array([1]), observs[2][[1]])
+        delta.begin_episode_batch(0, 1, True)
+        delta.observe_batch(np.array([0, 2]), observs[3][[0, 2]])
+        observs = observs.astype(task.dtype)
+        assert all((x[0] == 0).all() for x in record.batch_observs.values())
+        expected = [
+            [observs[1, 0] - observs[0, 0], np.zeros((4, 3))],
+            [observs[2, 1] - observs[0, 1]],
+            [observs[1, 2] - observs[0, 2], observs[3, 2] - observs[1, 2]]]
+        for index, differences in enumerate(expected):
+            actual = record.batch_observs[index][1:]
+            assert len(actual) == len(differences)
+            for difference, value in zip(actual, differences):
+                assert np.allclose(difference, value)
+                assert difference.dtype == task.dtype
+
+
+class TestBatch:
+
+    def _policy(self, task):
+        task.observs = Box(0, 255, (8, 6, 3))
+        policy = Sequential(task)
+        policy.add(mindpark.step.Score)
+        policy.add(mindpark.step.Image)
+        policy.add(mindpark.step.Maximum)
+        policy.add(mindpark.step.Skip, 2)
+        policy.add(mindpark.step.Grayscale, (1, 1, 1))
+        policy.add(mindpark.step.Subsample, (2, 2))
+        policy.add(mindpark.step.Delta)
+        policy.add(mindpark.step.History, 3)
+        policy.add(mindpark.step.Normalize)
+        policy.add(mindpark.step.ClampReward)
+        policy.add(Record)
+        return policy
+
+    def test_matches_individual_episodes(self, task):
+        lengths = [5, 8, 3]
+        observs = [
+            np.random.randint(0, 256, (x, 8, 6, 3)).astype(np.uint8)
+            for x in lengths]
+        rewards = [np.random.uniform(-2, 2, x) for x in lengths]
+        batched = self._policy(task)
+        for index in range(len(lengths)):
+            batched.begin_episode_batch(index, 0, True)
+        for time in range(max(lengths)):
+            indices = np.array(
+                [x for x, y in enumerate(lengths) if time < y])
+            actions = batched.observe_batch(
+                indices, np.array([observs[x][time] for x in indices]))
+            assert (actions == 1).all()
+            finals = np.array([time == lengths[x] - 1 for x in indices])
+            batched.receive_batch(
+                indices, np.array([rewards[x][time] for x in indices]),
+                finals)
+            for index in indices[finals]:
+                batched.end_episode_batch(index)
+        record = batched.steps[-1]
+        for index in range(len(lengths)):
+            single = self._policy(task)
+            single.begin_episode(0, True)
+            for time in range(lengths[index]):
+                single.observe(observs[index][time])
+                final = time == lengths[index] - 1
+                single.receive(rewards[index][time], final)
+            single.end_episode()
+            expected = single.steps[-1]
+            assert len(record.batch_observs[index]) == len(expected.observs)
+            for actual, observ in zip(
+                    record.batch_observs[index], expected.observs):
+                assert np.allclose(actual, observ)
+            assert np.allclose(
+                record.batch_rewards[index], expected.rewards)
+
+    def test_epsilon_greedy_matches_individual_episodes(self, tmpdir):
+        # Greedy, so that actions and metrics are deterministic.
+        observs = np.random.uniform(0, 1, (3, 6, 4))
+        results = {}
+        for mode in ('single', 'batch'):
+            task = Task(
+                Box(0, 1, (4,)), Discrete(4), str(tmpdir.mkdir(mode)),
+                1000, 3, True)
+            policy = Sequential(task)
+            policy.add(mindpark.step.EpsilonGreedy, 0, 0, 0)
+            policy.add(Values)
+            if mode == 'single':
+                actions = self._run_episodes(policy, observs)
+            else:
+                actions = self._run_batch(policy, observs)
+            MetricWriter.flush_all()
+            filename = '{}/stats.db'.format(task.directory)
+            metrics = {x: y.data for x, y in Reader()(filename)}
+            results[mode] = actions, metrics
+        actions, metrics = results['batch']
+        assert (actions == results['single'][0]).all()
+        assert (actions == observs.argmax(2)).all()
+        assert len(metrics) == 4
+        assert metrics.keys() == results['single'][1].keys()
+        for name, data in metrics.items():
+            assert np.allclose(data, results['single'][1][name])
+
+    def test_random_matches_individual_episodes(self, task):
+        # Separate policies per environment, stepped in the order of the
+        # batch, so that they draw the same random actions.
+        task.observs = Box(0, 1, (4,))
+        observs = np.random.uniform(0, 1, (3, 6, 4))
+        gym.spaces.prng.seed(0)
+        policies = [Sequential(task) for _ in observs]
+        expected = np.empty(observs.shape[:2], int)
+        for policy in policies:
+            policy.add(mindpark.step.Random)
+            policy.begin_episode(0, True)
+        for time in range(observs.shape[1]):
+            for index, policy in enumerate(policies):
+                expected[index, time] = policy.observe(observs[index, time])
+                policy.receive(0, time == observs.shape[1] - 1)
+        gym.spaces.prng.seed(0)
+        policy = Sequential(task)
+        policy.add(mindpark.step.Random)
+        actions = self._run_batch(policy, observs)
+        assert (actions == expected).all()
+
+    def _run_episodes(self, policy, observs):
+        actions = np.empty(observs.shape[:2], int)
+        for index in range(len(observs)):
+            policy.begin_episode(0, True)
+            for time, observ in enumerate(observs[index]):
+                actions[index, time] = policy.observe(observ)
+                policy.receive(0, time == observs.shape[1] - 1)
+            policy.end_episode()
+        return actions
+
+    def _run_batch(self, policy, observs):
+        indices = np.arange(len(observs))
+        actions = np.empty(observs.shape[:2], int)
+        for index in indices:
+            policy.begin_episode_batch(index, 0, True)
+        for time in range(observs.shape[1]):
+            actions[:, time] = policy.observe_batch(indices, observs[:, time])
+            finals = np.full(len(indices), time == observs.shape[1] - 1)
+            policy.receive_batch(indices, np.zeros(len(indices)), finals)
+        for index in indices:
+            policy.end_episode_batch(index)
+        return actions
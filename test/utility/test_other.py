@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from mindpark.utility import (
+    aggregate, bin_borders, count_categories, push_rows)
+
+
+@pytest.fixture
+def groups():
+    random = np.random.RandomState(0)
+    values = random.normal(0, 1, (100, 2))
+    # Include empty groups at the start, in the middle, and at the end.
+    borders = np.array([0, 0, 10, 10, 55, 56, 100, 100])
+    return values, borders
+
+
+def _loop(values, borders, reducer):
+    groups = []
+    for start, stop in zip(borders[:-1], borders[1:]):
+        if start == stop:
+            groups.append(np.full(values.shape[1:], np.nan))
+        else:
+            groups.append(reducer(values[start: stop]))
+    return np.array(groups)
+
+
+class TestAggregate:
+
+    def test_mean_and_sum(self, groups):
+        values, borders = groups
+        expected = _loop(values, borders, lambda x: x.mean(0))
+        assert np.allclose(
+            aggregate(values, borders, 'mean'), expected, equal_nan=True)
+        expected = np.nan_to_num(_loop(values, borders, lambda x: x.sum(0)))
+        assert np.allclose(aggregate(values, borders, 'sum'), expected)
+
+    @pytest.mark.parametrize('percentile', [0, 10, 50, 90, 100])
+    def test_percentiles(self, groups, percentile):
+        values, borders = groups
+        reducer = lambda x: np.percentile(x, percentile, 0)
+        expected = _loop(values, borders, reducer)
+        actual = aggregate(values, borders, percentile)
+        assert np.allclose(actual, expected, equal_nan=True)
+
+    def test_count_and_function(self, groups):
+        values, borders = groups
+        counts = aggregate(values, borders, 'count')
+        assert counts.tolist() == [0, 10, 0, 45, 1, 44, 0]
+        reducer = lambda x: x.max(0)
+        expected = _loop(values, borders, reducer)
+        actual = aggregate(values, borders, reducer)
+        assert np.allclose(actual, expected, equal_nan=True)
+
+    def test_unknown_reducer(self, groups):
+        with pytest.raises(KeyError):
+            aggregate(*groups, 'median')
+
+    def test_ignore_values_outside_borders(self):
+        values = np.arange(10)
+        borders = np.array([2, 5, 8])
+        assert aggregate(values, borders, 'sum').tolist() == [9, 18]
+        assert aggregate(values, borders, 50).tolist() == [3, 6]
+
+
+class TestBinBorders:
+
+    def test_cover_all_values(self):
+        domain = np.sort(np.random.uniform(0, 10, 1000))
+        borders = bin_borders(domain, 7)
+        assert borders[0] == 0
+        assert borders[-1] == len(domain)
+        assert (np.diff(borders) >= 0).all()
+
+    def test_equal_width(self):
+        domain = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8])
+        assert bin_borders(domain, 4).tolist() == [0, 2, 4, 6, 9]
+
+
+class TestCountCategories:
+
+    def test_counts_per_group(self):
+        indices = np.array([0, 1, 1, 2, 2, 2, 0])
+        borders = np.array([0, 3, 3, 7])
+        counts = count_categories(indices, borders, 4)
+        assert counts.tolist() == [[1, 2, 0, 0], [0, 0, 0, 0], [1, 0, 3, 0]]
+
+
+class TestPushRows:
+
+    def test_ring_per_environment(self):
+        offsets = np.zeros(3, int)
+        buffer = push_rows(
+            None, offsets, np.array([0, 2]), np.array([1, 2]), 2, float)
+        assert buffer.shape == (3, 2) and buffer.dtype == float
+        assert buffer[[0, 2]].tolist() == [[1, 1], [2, 2]]
+        buffer = push_rows(buffer, offsets, np.array([2]), np.array([3.0]), 2)
+        assert buffer[2].tolist() == [2, 3]
+        assert offsets.tolist() == [1, 0, 2]
@@ -0,0 +1,61 @@
+import threading
+import time
+from mindpark.utility import ReadWriteLock
+
+
+class TestReadWriteLock:
+
+    def test_concurrent_readers(self):
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def read():
+            with lock.read():
+                barrier.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def read():
+            with lock.read():
+                events.append('read')
+
+        with lock.write():
+            thread = threading.Thread(target=read)
+            thread.start()
+            time.sleep(0.05)
+            events.append('write')
+        thread.join()
+        assert events == ['write', 'read']
+
+    def test_waiting_writer_blocks_new_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def write():
+            with lock.write():
+                events.append('write')
+
+        def read():
+            with lock.read():
+                events.append('read')
+
+        with lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.05)
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            assert events == []
+        writer.join()
+        reader.join()
+        assert events == ['write', 'read']